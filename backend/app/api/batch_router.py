@@ -0,0 +1,73 @@
+# app/api/batch_router.py
+
+import zipfile
+from typing import List
+
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from app.services.batch_service import batch_service, BatchTooLargeError
+from app.services.document_service import document_service, FileTooLargeError
+
+router = APIRouter(prefix="/api", tags=["Batch"])
+
+PDF_TYPES = {"application/pdf"}
+ZIP_TYPES = {"application/zip", "application/x-zip-compressed"}
+
+
+def _part_kind(file: UploadFile) -> str | None:
+    name = (file.filename or "").lower()
+    if name.endswith(".zip") or file.content_type in ZIP_TYPES:
+        return "zip"
+    if name.endswith(".pdf") or file.content_type in PDF_TYPES:
+        return "pdf"
+    return None
+
+
+@router.post("/batch")
+async def process_batch(
+    files: List[UploadFile] = File(...),
+    override_type: str | None = None,
+    include_summary: bool = False,
+    include_embeddings: bool = False,
+):
+    """
+    Run upload -> OCR -> classify -> extract for many documents at once.
+
+    Accepts PDFs and/or .zip archives of PDFs, up to BATCH_MAX_FILES
+    documents in total. Each part is streamed to disk under the upload
+    size limit. Results come back in input order, each with status "ok"
+    or "error".
+    """
+
+    kinds = [_part_kind(file) for file in files]
+    unsupported = [file.filename for file, kind in zip(files, kinds) if kind is None]
+    if unsupported:
+        raise HTTPException(status_code=415, detail=f"Only PDF and zip files are accepted: {unsupported}")
+    if len(files) > batch_service.max_files:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {batch_service.max_files} documents")
+
+    documents = []
+    for file, kind in zip(files, kinds):
+        try:
+            if kind == "zip":
+                budget = batch_service.max_files - len(documents)
+                documents.extend(await batch_service.expand_zip(file, budget))
+            else:
+                file_id, deduplicated, _ = await document_service.save_stream(file)
+                documents.append((file.filename, file_id, deduplicated))
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail=f"Invalid zip archive: {file.filename}")
+        except (FileTooLargeError, BatchTooLargeError) as e:
+            raise HTTPException(status_code=413, detail=f"{file.filename}: {e}")
+
+        if len(documents) > batch_service.max_files:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {batch_service.max_files} documents")
+
+    if not documents:
+        raise HTTPException(status_code=400, detail="No PDF documents in request")
+
+    return await batch_service.process(
+        documents,
+        override_type=override_type,
+        include_summary=include_summary,
+        include_embeddings=include_embeddings,
+    )
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter
 from app.services.cache_service import cache_service
+from app.nlp.preprocess import preprocessor
 
 router = APIRouter(prefix="/api/cache", tags=["Cache Management"])
 
@@ -10,13 +11,15 @@ router = APIRouter(prefix="/api/cache", tags=["Cache Management"])
 def get_cache_stats():
     """
     Get cache statistics.
-    Returns total entries, size, and breakdown by operation.
+    Returns total entries, size, and breakdown by operation, plus the
+    prompt tokens saved by preprocessing on calls that reached Gemini.
     """
     stats = cache_service.stats()
 
     return {
         "status": "ok",
         "cache_stats": stats,
+        "prompt_token_stats": preprocessor.stats(),
         "message": f"Cache contains {stats['total_entries']} entries"
     }
 
@@ -2,10 +2,10 @@
 
 from fastapi import APIRouter, Query, HTTPException
 from app.services.document_service import document_service
-from app.llm.gemini_client import GeminiClient
+from app.detectors.hybrid_classifier import hybrid_classifier
+from app.utils.metrics import track_stage
 
 router = APIRouter(prefix="/api", tags=["Document Detection"])
-gemini = GeminiClient()
 
 @router.post("/detect")
 async def detect_document(file_id: str = Query(...)):
@@ -14,10 +14,19 @@ async def detect_document(file_id: str = Query(...)):
     if not text:
         raise HTTPException(status_code=400, detail="OCR missing. Run /api/ocr first.")
 
-    result = gemini.classify_document(text)
+    # Local rules first; Gemini only for ambiguous documents
+    with track_stage("classify"):
+        result = await hybrid_classifier.classify_async(text)
 
     return {
         "file_id": file_id,
         "document_type": result.get("document_type", "unknown"),
         "confidence": result.get("confidence", 0.0),
+        "classified_by": result.get("classified_by"),
     }
+
+
+@router.get("/detect/stats")
+def detect_stats():
+    """Share of classifications decided locally vs. by Gemini."""
+    return {"status": "ok", "classifier_stats": hybrid_classifier.stats()}
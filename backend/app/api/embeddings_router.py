@@ -0,0 +1,105 @@
+# app/api/embeddings_router.py
+
+import asyncio
+
+from fastapi import APIRouter, HTTPException
+from app.detectors.hybrid_classifier import hybrid_classifier
+from app.llm.gemini_client import gemini
+from app.models.embeddings_model import EmbeddingBatchRequest
+from app.services.document_service import document_service
+from app.services.embedding_store import embedding_store
+from app.services.nlp_service import nlp_service
+from app.services.pipeline_service import pipeline_service
+from app.utils.metrics import track_stage
+
+router = APIRouter(prefix="/api/embeddings", tags=["Embeddings"])
+
+
+async def _document_type(file_id: str, text: str) -> str:
+    """
+    Type already on record in the store, else the rules classifier, else
+    Gemini (cached). Gemini calls share the pipeline's LLM limit, so a
+    large batch cannot start one classify call per document at once.
+    """
+    known = embedding_store.get_type(file_id)
+    if known and known != "unknown":
+        return known
+
+    detected = hybrid_classifier.classify_local(text)
+    if detected is None:
+        async with pipeline_service.llm_limit:
+            detected = await hybrid_classifier.classify_remote_async(text)
+    return detected.get("document_type") or "unknown"
+
+
+@router.post("/batch")
+async def embed_batch(request: EmbeddingBatchRequest):
+    """
+    Embed many texts and/or OCR'd documents in as few Gemini calls as
+    possible. Cached vectors are reused; results come back in input
+    order. Documents get the same pooled-chunk vector as /api/extract
+    and are also added to the similarity-search store.
+    """
+    if not request.texts and not request.file_ids:
+        raise HTTPException(status_code=400, detail="Provide texts and/or file_ids.")
+
+    doc_texts = {fid: document_service.get_text(fid) for fid in request.file_ids}
+    ready = [fid for fid in request.file_ids if doc_texts[fid]]
+
+    with track_stage("embed"):
+        text_vectors, doc_results, doc_types = await asyncio.gather(
+            gemini.generate_embeddings_batch_async(request.texts),
+            gemini.generate_documents_embeddings_async([doc_texts[fid] for fid in ready]),
+            asyncio.gather(*(_document_type(fid, doc_texts[fid]) for fid in ready)),
+        )
+    doc_types = dict(zip(ready, doc_types))
+    doc_vectors = {fid: result["vector"] for fid, result in zip(ready, doc_results)}
+    vectors = text_vectors + list(doc_vectors.values())
+
+    documents = []
+    for fid in request.file_ids:
+        vector = doc_vectors.get(fid)
+        if vector is None:
+            documents.append({"file_id": fid, "status": "error", "detail": "OCR missing. Run /api/ocr first."})
+        elif not vector:
+            documents.append({"file_id": fid, "status": "error", "detail": "Embedding failed"})
+        else:
+            embedding_store.add(fid, vector, doc_types[fid])
+            documents.append({"file_id": fid, "status": "ok", "document_type": doc_types[fid], "embedding": vector})
+
+    return {
+        "embeddings": text_vectors,
+        "documents": documents,
+        "embedded": sum(1 for v in vectors if v),
+        "failed": sum(1 for v in vectors if not v) + len(request.file_ids) - len(ready),
+    }
+
+
+@router.post("/document/{file_id}")
+async def embed_document(file_id: str, include_chunks: bool = True):
+    """
+    Long-document embedding: overlapping chunks, each embedded and cached
+    on its own, pooled into one document vector. After an edit only the
+    changed chunks are sent to Gemini again.
+    """
+    text = document_service.get_text(file_id)
+    if not text:
+        raise HTTPException(status_code=400, detail="OCR missing. Run /api/ocr first.")
+
+    result, doc_type = await asyncio.gather(
+        nlp_service.embed_document_async(text),
+        _document_type(file_id, text),
+    )
+    if not result["vector"]:
+        raise HTTPException(status_code=502, detail="Embedding failed")
+
+    embedding_store.add(file_id, result["vector"], doc_type)
+
+    return {
+        "file_id": file_id,
+        "document_type": doc_type,
+        "embedding": result["vector"],
+        "chunk_count": len(result["chunks"]),
+        "failed_chunks": result["failed_chunks"],
+        "chunks": result["chunks"] if include_chunks else None,
+    }
@@ -2,48 +2,46 @@
 
 from fastapi import APIRouter, HTTPException
 from app.services.document_service import document_service
-from app.llm.gemini_client import GeminiClient
-from app.services.nlp_service import nlp_service
+from app.services.pipeline_service import pipeline_service
+from app.extractors.hybrid_extractor import hybrid_extractor
 
 router = APIRouter(prefix="/api", tags=["Extraction"])
-gemini = GeminiClient()
 
 @router.post("/extract/{file_id}")
 async def extract_document(
     file_id: str,
     override_type: str | None = None,
     include_summary: bool = False,
-    include_embeddings: bool = False
+    include_embeddings: bool = False,
+    combined: bool | None = None,
+    reuse_near_duplicate: bool | None = None
 ):
-    # 1. Get OCR text
-    text = document_service.get_text(file_id)
-    if not text:
+    """
+    Classify and extract an already OCR'd document.
+
+    Runs the classify and extract stages of pipeline_service on the stored
+    text, so near-duplicate reuse, combined mode and the Gemini concurrency
+    limit behave exactly as in /api/process and background jobs.
+    """
+    if not document_service.get_text(file_id):
         raise HTTPException(status_code=400, detail="OCR missing. Run /api/ocr first.")
 
-    # 2. Detect type using Gemini
-    detected = gemini.classify_document(text)
-    detected_type = detected.get("document_type")
-    confidence = detected.get("confidence", 0.0)
-
-    # Use override only if provided
-    used_type = override_type or detected_type
-
-    # 3. Extract structured information
-    extraction = gemini.extract_structured(text, used_type)
-
-    # 4. Summary
-    summary = gemini.summarize(text) if include_summary else None
-
-    # 5. Embeddings
-    embeddings = nlp_service.embed_text(text) if include_embeddings else None
-
-    return {
-        "file_id": file_id,
-        "detected_type": detected_type,
-        "used_type": used_type,
-        "override_used": override_type is not None,
-        "detection_confidence": confidence,
-        "extraction": extraction,
-        "summary": summary,
-        "embeddings": embeddings,
-    }
+    stages = pipeline_service.process_stages(
+        file_id,
+        reuse_text=True,
+        override_type=override_type,
+        include_summary=include_summary,
+        include_embeddings=include_embeddings,
+        combined=combined,
+        reuse_near_duplicate=reuse_near_duplicate,
+    )
+    async for stage, payload in stages:
+        if stage == "extract":
+            payload.pop("elapsed_ms")
+            return payload
+
+
+@router.get("/extract/stats")
+def extract_stats():
+    """Share of extractions completed by rules alone vs. with Gemini."""
+    return {"status": "ok", "extractor_stats": hybrid_extractor.stats()}
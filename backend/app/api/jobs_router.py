@@ -0,0 +1,55 @@
+# app/api/jobs_router.py
+
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from app.services.document_service import document_service, FileTooLargeError
+from app.services.job_service import job_service
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+@router.post("")
+async def submit_job(
+    file_id: str | None = None,
+    file: UploadFile | None = File(None),
+    override_type: str | None = None,
+    include_summary: bool = False,
+    include_embeddings: bool = False,
+):
+    """
+    Queue OCR -> classify -> extract in the background.
+
+    Pass either an existing file_id or a file to upload. Returns the job
+    immediately; poll GET /api/jobs/{job_id} for progress and results.
+    """
+
+    if file is not None:
+        try:
+            file_id, _, _ = await document_service.save_stream(file)
+        except FileTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+
+    if not file_id:
+        raise HTTPException(status_code=400, detail="Provide file_id or file")
+
+    if not document_service.has_file(file_id):
+        raise HTTPException(status_code=404, detail=f"File not found in uploads/: {file_id}")
+
+    return job_service.submit(
+        file_id,
+        override_type=override_type,
+        include_summary=include_summary,
+        include_embeddings=include_embeddings,
+    )
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str):
+    """
+    Job status: queued | running | done | failed, with current stage,
+    progress (0-1), per-stage timings and, once done, the result.
+    """
+
+    job = job_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
@@ -0,0 +1,13 @@
+# app/api/metrics_router.py
+
+from fastapi import APIRouter, Response
+from app.utils import metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics")
+def prometheus_metrics():
+    """Prometheus text exposition format; see app/utils/metrics.py."""
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
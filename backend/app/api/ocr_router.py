@@ -1,6 +1,9 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException
-from app.services.ocr_service import ocr_service
+from app.services.ingest_service import ingest_service
 from app.services.document_service import document_service
+from app.services.near_duplicate_service import near_duplicate_index
 from app.models.ocr_response import OCRResponse
 
 router = APIRouter(prefix="/api/ocr", tags=["OCR"])
@@ -13,8 +16,26 @@ async def perform_ocr(file_id: str):
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
+    # Reuse OCR text already produced for identical content
+    existing_id = document_service.find_by_hash(document_service.content_hash(raw_bytes))
+    text = document_service.get_text(existing_id) if existing_id else None
+    if text is not None:
+        if existing_id != file_id:
+            document_service.save_text(file_id, text)
+        layout = document_service.get_layout(existing_id) or {}
+        if existing_id != file_id and layout:
+            document_service.save_layout(file_id, layout)
+        return OCRResponse(
+            file_id=file_id,
+            text=text,
+            deduplicated=True,
+            ocr_pages=layout.get("ocr_pages"),
+            text_layer_pages=layout.get("text_layer_pages"),
+        )
+
     try:
-        text = ocr_service.extract_text(raw_bytes)
+        # Embedded text layer first; Document AI only for scanned pages
+        text, layout = await ingest_service.extract_async(raw_bytes)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -22,5 +43,15 @@ async def perform_ocr(file_id: str):
         )
 
     document_service.save_text(file_id, text)
+    document_service.save_layout(file_id, layout)
+
+    # Index for re-scan detection; reports the closest earlier document
+    near_duplicate = await asyncio.to_thread(near_duplicate_index.add, file_id, text)
 
-    return OCRResponse(file_id=file_id, text=text)
+    return OCRResponse(
+        file_id=file_id,
+        text=text,
+        ocr_pages=layout.get("ocr_pages"),
+        text_layer_pages=layout.get("text_layer_pages"),
+        near_duplicate=near_duplicate,
+    )
@@ -0,0 +1,70 @@
+# app/api/process_router.py
+
+import json
+
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import StreamingResponse
+from app.services.document_service import FileTooLargeError
+from app.services.pipeline_service import pipeline_service
+
+router = APIRouter(prefix="/api", tags=["Pipeline"])
+
+
+@router.post("/process")
+async def process_document(
+    file: UploadFile = File(...),
+    override_type: str | None = None,
+    include_summary: bool = False,
+    include_embeddings: bool = False,
+    combined: bool | None = None,
+    reuse_near_duplicate: bool | None = None,
+    stream: bool = False,
+):
+    """
+    Upload -> OCR -> classify -> extract in one request.
+
+    With stream=true the response is NDJSON, one line per finished stage:
+        {"stage": "upload", ...}
+        {"stage": "ocr", ...}
+        {"stage": "detect", ...}
+        {"stage": "extract", ...}
+    A failure is reported as a final {"stage": "error", "detail": ...} line.
+    """
+
+    options = {
+        "filename": file.filename,
+        "override_type": override_type,
+        "include_summary": include_summary,
+        "include_embeddings": include_embeddings,
+        "combined": combined,
+        "reuse_near_duplicate": reuse_near_duplicate,
+    }
+
+    stages = pipeline_service.run_stages(file, **options)
+
+    # The upload stage streams the file to disk; finish it before the
+    # response starts so an oversized file still gets a 413
+    try:
+        first = await stages.__anext__()
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    async def all_stages():
+        yield first
+        async for item in stages:
+            yield item
+
+    if stream:
+        async def event_stream():
+            try:
+                async for stage, payload in all_stages():
+                    yield json.dumps({"stage": stage, **payload}) + "\n"
+            except Exception as e:
+                yield json.dumps({"stage": "error", "detail": str(e)}) + "\n"
+
+        return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+    try:
+        return await pipeline_service.collect(all_stages())
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
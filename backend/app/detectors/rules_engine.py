@@ -0,0 +1,172 @@
+# app/detectors/rules_engine.py
+
+"""
+Scored keyword rules engine for document classification.
+
+All keywords for all document types go into one Aho-Corasick automaton,
+built over word tokens rather than characters, so a single linear pass
+over the text finds every keyword hit regardless of how many rules are
+loaded. Matching is whole-word and case-insensitive. "bill to" matches
+"Bill-To" but not "billing tokens".
+
+Rules load from a JSON file (RULES_CONFIG_PATH, default rules.json next
+to this module):
+
+    {
+      "saturation_score": 8,
+      "header_confidence": 0.97,
+      "headers": {"invoice": ["invoice", "tax invoice"], ...},
+      "types":   {"invoice": {"bill to": 2, "due date": 2, ...}, ...}
+    }
+
+A type's score is the sum of weights of the distinct keywords found.
+"""
+
+import json
+import os
+import re
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), "rules.json")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class AhoCorasick:
+    """
+    Multi-pattern automaton over token sequences.
+    Each pattern is a tuple of tokens; search() reports every occurrence,
+    overlapping ones included, in one pass over the input tokens.
+    """
+
+    def __init__(self, patterns: Sequence[Tuple[str, ...]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+
+        for pid, pattern in enumerate(patterns):
+            node = 0
+            for token in pattern:
+                nxt = self.goto[node].get(token)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][token] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(pid)
+
+        # Breadth-first failure links; outputs inherit from the fail target
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and token not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(token, 0)
+                self.fail[child] = target if target != child else 0
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def search(self, tokens: Sequence[str]) -> List[int]:
+        """Pattern ids of every match, in order of match end."""
+        goto, fail, out = self.goto, self.fail, self.out
+        node = 0
+        hits = []
+
+        for token in tokens:
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if out[node]:
+                hits.extend(out[node])
+
+        return hits
+
+
+class RulesEngine:
+
+    def __init__(self, config_path: Optional[str] = None):
+        path = config_path or os.getenv("RULES_CONFIG_PATH", DEFAULT_RULES_PATH)
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+
+        self.saturation = float(config.get("saturation_score", 8))
+        self.header_confidence = float(config.get("header_confidence", 0.97))
+
+        self.headers = {
+            " ".join(tokenize(title)): doc_type
+            for doc_type, titles in config.get("headers", {}).items()
+            for title in titles
+        }
+
+        # One automaton entry per distinct keyword; a keyword shared by
+        # several types ("subtotal") carries a weight for each of them
+        keyword_weights: Dict[Tuple[str, ...], Dict[str, float]] = {}
+        for doc_type, keywords in config.get("types", {}).items():
+            for keyword, weight in keywords.items():
+                key = tuple(tokenize(keyword))
+                if key:
+                    keyword_weights.setdefault(key, {})[doc_type] = float(weight)
+
+        self.types = list(config.get("types", {}))
+        self.keywords = list(keyword_weights)
+        self.weights = [keyword_weights[k] for k in self.keywords]
+        self.automaton = AhoCorasick(self.keywords)
+
+    def header_type(self, text: str) -> Optional[str]:
+        """Type named by the document's title line, if it is a known title."""
+        for line in text.splitlines():
+            if line.strip():
+                return self.headers.get(" ".join(tokenize(line)))
+        return None
+
+    def score(self, text: str) -> Dict[str, float]:
+        """Per-type score: summed weights of distinct keywords present."""
+        scores = dict.fromkeys(self.types, 0.0)
+
+        for pid in set(self.automaton.search(tokenize(text))):
+            for doc_type, weight in self.weights[pid].items():
+                scores[doc_type] += weight
+
+        return scores
+
+    def classify(self, text: str) -> dict:
+        """
+        Returns:
+            {"type", "confidence", "scores"}; type is "unknown" with
+            confidence 0.0 when no keyword matched.
+
+        Confidence is the winner's share of all keyword evidence, scaled
+        down while its own score is below saturation_score.
+        """
+        header = self.header_type(text)
+        if header:
+            return {"type": header, "confidence": self.header_confidence, "scores": {}}
+
+        scores = self.score(text)
+        best = max(scores, key=scores.get, default=None)
+        total = sum(scores.values())
+
+        if not best or scores[best] <= 0:
+            return {"type": "unknown", "confidence": 0.0, "scores": scores}
+
+        share = scores[best] / total
+        evidence = min(1.0, scores[best] / self.saturation)
+
+        return {
+            "type": best,
+            "confidence": round(share * evidence, 2),
+            "scores": scores,
+        }
+
+
+# Singleton instance
+rules_engine = RulesEngine()
@@ -0,0 +1,165 @@
+# app/extractors/hybrid_extractor.py
+
+import os
+import re
+import threading
+from typing import Optional
+
+from app.extractors import layout_parser
+from app.extractors.invoice_extractor import invoice_extractor
+from app.extractors.receipt_extractor import receipt_extractor
+from app.extractors.po_extractor import po_extractor
+from app.extractors.id_extractor import id_extractor
+from app.llm.gemini_client import gemini
+from app.utils.metrics import track_stage
+
+
+# Local extractor and the fields it must find for a type to skip Gemini
+LOCAL_EXTRACTORS = {
+    "invoice": (
+        invoice_extractor,
+        ["invoice_number", "invoice_date", "vendor_name", "total_amount"],
+    ),
+    "receipt": (
+        receipt_extractor,
+        ["merchant_name", "receipt_date", "total_amount"],
+    ),
+    "purchase_order": (
+        po_extractor,
+        ["po_number", "vendor", "date"],
+    ),
+    "id_card": (
+        id_extractor,
+        ["full_name", "id_number", "date_of_birth"],
+    ),
+}
+
+# Party names come from "first plausible line" heuristics; these are
+# checked before a filled value counts as found
+NAME_FIELDS = {"vendor_name", "merchant_name", "vendor"}
+
+# A date, an amount or a "Label:" prefix means the heuristic grabbed the
+# wrong line (e.g. "Date: 01/02/2024")
+NOT_A_NAME = re.compile(
+    r"\d{1,4}[./-]\d{1,2}[./-]\d{1,4}"
+    r"|\d[\d.,]*[.,]\d{2}\b"
+    r"|^[^:]{1,25}:",
+)
+
+
+class HybridExtractor:
+    """
+    Rule-based extractors first, Gemini only for the fields they miss.
+
+    For types with a local extractor, a result that has every required
+    field (and passes the name and amount sanity checks) is returned
+    without any LLM call. Otherwise Gemini is asked for the missing fields only and
+    its answers fill the gaps. Types without a local extractor go to the
+    full Gemini extraction as before. Every result carries
+    "extracted_by": "rules", "rules+gemini" or "gemini".
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("EXTRACT_HYBRID_MODE", "true").lower() in ("1", "true", "yes")
+        self.counts = {"rules": 0, "rules+gemini": 0, "gemini": 0}
+        self._lock = threading.Lock()
+
+    def _record(self, path: str):
+        with self._lock:
+            self.counts[path] += 1
+
+    def extract_local(self, text: str, doc_type: str, layout: Optional[dict] = None) -> Optional[dict]:
+        """
+        Run the local extractor for doc_type. With a Document AI layout,
+        line items come from its tables and its form fields fill required
+        fields the text rules missed.
+
+        Returns:
+            {"fields", "missing", "confidence"}, or None if the type has
+            no local extractor. confidence is the share of required
+            fields found.
+        """
+        entry = LOCAL_EXTRACTORS.get(doc_type)
+        if entry is None:
+            return None
+
+        extractor, required = entry
+        fields = extractor.extract(text, layout).model_dump(exclude={"raw_text"})
+        fields["document_type"] = doc_type
+
+        form_fields = layout_parser.known_fields(layout)
+        for name in required:
+            if fields.get(name) in (None, "") and name in form_fields:
+                value = form_fields[name]
+                fields[name] = layout_parser.parse_number(value) if name.endswith("_amount") else value
+
+        # Implausible names are dropped so Gemini is asked for them
+        for name in required:
+            if name in NAME_FIELDS and isinstance(fields.get(name), str) and NOT_A_NAME.search(fields[name]):
+                fields[name] = None
+
+        missing = [name for name in required if fields.get(name) in (None, "")]
+
+        # Totals that contradict their parts are not trusted
+        if _amounts_inconsistent(fields) and "total_amount" not in missing:
+            fields["total_amount"] = None
+            missing.append("total_amount")
+
+        return {
+            "fields": fields,
+            "missing": missing,
+            "confidence": round(1 - len(missing) / len(required), 2),
+        }
+
+    async def extract_async(self, text: str, doc_type: str, layout: Optional[dict] = None) -> dict:
+        with track_stage("extract"):
+            return await self._extract_async(text, doc_type, layout)
+
+    async def _extract_async(self, text: str, doc_type: str, layout: Optional[dict]) -> dict:
+        local = self.extract_local(text, doc_type, layout) if self.enabled else None
+
+        if local is None:
+            self._record("gemini")
+            result = await gemini.extract_structured_async(text, doc_type)
+            return {**result, "extracted_by": "gemini"}
+
+        fields = local["fields"]
+        if not local["missing"]:
+            self._record("rules")
+            return {**fields, "extracted_by": "rules"}
+
+        # Ask only for what the rules could not find
+        self._record("rules+gemini")
+        filled = await gemini.extract_fields_async(text, doc_type, local["missing"])
+        for name in local["missing"]:
+            if filled.get(name) not in (None, ""):
+                fields[name] = filled[name]
+
+        return {**fields, "extracted_by": "rules+gemini"}
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts)
+
+        total = sum(counts.values())
+        return {
+            "enabled": self.enabled,
+            "total": total,
+            "completed_by_rules": counts["rules"],
+            "completed_by_rules_plus_gemini": counts["rules+gemini"],
+            "completed_by_gemini": counts["gemini"],
+            "llm_calls_avoided_pct": round(100 * counts["rules"] / total, 2) if total else 0.0,
+        }
+
+
+def _amounts_inconsistent(fields: dict) -> bool:
+    subtotal = fields.get("subtotal_amount")
+    tax = fields.get("tax_amount")
+    total = fields.get("total_amount")
+    if None in (subtotal, tax, total):
+        return False
+    return abs(subtotal + tax - total) > 0.01
+
+
+# Singleton instance
+hybrid_extractor = HybridExtractor()
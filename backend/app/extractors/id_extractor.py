@@ -1,9 +1,10 @@
 # app/extractors/id_extractor.py
 
-import re
 from typing import Optional
 from pydantic import BaseModel, Field
 
+from app.extractors import patterns
+
 
 class IDExtractionResult(BaseModel):
     document_type: str = Field(default="id_card")
@@ -22,76 +23,28 @@ class IDExtractor:
     Rule-based ID card extractor.
     """
 
-    def _find_first(self, patterns, text: str) -> Optional[str]:
-        for p in patterns:
-            m = re.search(p, text, re.IGNORECASE)
-            if m:
-                return m.group(1).strip()
-        return None
-
-    def extract(self, text: str) -> IDExtractionResult:
+    def extract(self, text: str, layout: Optional[dict] = None) -> IDExtractionResult:
         if not text:
             return IDExtractionResult(raw_text="")
 
         # Very generic – you can add country-specific patterns
-        id_number = self._find_first(
-            [
-                r"ID\s*No\.?[:\s]*([A-Z0-9\-]+)",
-                r"ID\s*Number[:\s]*([A-Z0-9\-]+)",
-                r"Number[:\s]*([A-Z0-9\-]{6,})",
-            ],
-            text,
-        )
+        id_number = patterns.find_first(patterns.ID_NUMBER, text)
 
-        full_name = self._find_first(
-            [
-                r"Name[:\s]*([^\n]+)",
-                r"Full\s*Name[:\s]*([^\n]+)",
-            ],
-            text,
-        )
+        full_name = patterns.find_first(patterns.ID_FULL_NAME, text)
 
-        date_of_birth = self._find_first(
-            [
-                r"DOB[:\s]*([0-9]{1,2}[-/][0-9]{1,2}[-/][0-9]{2,4})",
-                r"Date\s*of\s*Birth[:\s]*([0-9]{1,2}[-/][0-9]{1,2}[-/][0-9]{2,4})",
-            ],
-            text,
-        )
+        date_of_birth = patterns.find_first(patterns.ID_DATE_OF_BIRTH, text)
 
-        issue_date = self._find_first(
-            [
-                r"Issue\s*Date[:\s]*([0-9]{1,2}[-/][0-9]{1,2}[-/][0-9]{2,4})",
-                r"Issued\s*On[:\s]*([0-9]{1,2}[-/][0-9]{1,2}[-/][0-9]{2,4})",
-            ],
-            text,
-        )
+        issue_date = patterns.find_first(patterns.ID_ISSUE_DATE, text)
 
-        expiry_date = self._find_first(
-            [
-                r"Expiry\s*Date[:\s]*([0-9]{1,2}[-/][0-9]{1,2}[-/][0-9]{2,4})",
-                r"Valid\s*Till[:\s]*([0-9]{1,2}[-/][0-9]{1,2}[-/][0-9]{2,4})",
-            ],
-            text,
-        )
+        expiry_date = patterns.find_first(patterns.ID_EXPIRY_DATE, text)
 
-        address = self._find_first(
-            [
-                r"Address[:\s]*([^\n]+)",
-            ],
-            text,
-        )
+        address = patterns.find_first(patterns.ID_ADDRESS, text)
 
         # Guess ID type
-        id_type = None
-        if re.search(r"Passport", text, re.IGNORECASE):
-            id_type = "passport"
-        elif re.search(r"Driving\s*Licence|Driver's\s*License", text, re.IGNORECASE):
-            id_type = "driving_license"
-        elif re.search(r"Aadhar|Aadhaar", text, re.IGNORECASE):
-            id_type = "aadhaar"
-        elif re.search(r"PAN\s*Card", text, re.IGNORECASE):
-            id_type = "pan_card"
+        id_type = next(
+            (name for name, pattern in patterns.ID_TYPES if pattern.search(text)),
+            None,
+        )
 
         return IDExtractionResult(
             id_type=id_type,
@@ -1,9 +1,11 @@
 # app/extractors/invoice_extractor.py
 
-import re
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
+from app.extractors import layout_parser, patterns
+from app.extractors.scanner import FieldScanner
+
 
 class InvoiceItem(BaseModel):
     description: Optional[str] = None
@@ -39,92 +41,80 @@ class InvoiceExtractor:
     """
 
     def __init__(self):
-        # Basic money pattern
-        self.money_pattern = re.compile(r"([A-Z]{3})?\s?(\d{1,3}(?:[,\d]{3})*(?:\.\d+)?)")
-
-    def _find_first(self, patterns, text: str) -> Optional[str]:
-        for p in patterns:
-            match = re.search(p, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return None
-
-    def _find_amount(self, label_patterns, text: str) -> Optional[float]:
-        for lbl in label_patterns:
-            # capture label then number
-            regex = rf"{lbl}[:\s]*([A-Z]{{3}})?\s?(\d{{1,3}}(?:[,\d]{{3}})*(?:\.\d+)?)"
-            match = re.search(regex, text, re.IGNORECASE)
-            if match:
-                num_str = match.group(2).replace(",", "")
-                try:
-                    return float(num_str)
-                except ValueError:
-                    continue
-        return None
-
-    def extract(self, text: str) -> InvoiceExtractionResult:
+        # All regex fields are filled from one walk over the text
+        self.scanner = FieldScanner(
+            patterns.INVOICE_KEYWORDS,
+            {
+                "invoice_number": patterns.INVOICE_NUMBER,
+                "invoice_date": patterns.INVOICE_DATE,
+                "due_date": patterns.INVOICE_DUE_DATE,
+                "subtotal": patterns.INVOICE_SUBTOTAL,
+                "tax": patterns.INVOICE_TAX,
+                "total": patterns.INVOICE_TOTAL,
+                "currency": (patterns.CURRENCY_CODE,),
+                "bill_to": (patterns.INVOICE_BILL_TO,),
+            },
+        )
+
+    def _text(self, found, name: str) -> Optional[str]:
+        m = found.get(name)
+        return m.group(1).strip() if m else None
+
+    def _amount(self, found, name: str) -> Optional[float]:
+        # The amount group is digits, commas and one optional decimal part,
+        # so it always parses once commas are removed
+        m = found.get(name)
+        return float(m.group(2).replace(",", "")) if m else None
+
+    def extract(self, text: str, layout: Optional[dict] = None) -> InvoiceExtractionResult:
         if not text:
             return InvoiceExtractionResult(raw_text="")
 
-        # Invoice number
-        invoice_number = self._find_first(
-            [
-                r"Invoice\s*No\.?\s*[:#]\s*(\S+)",
-                r"Invoice\s*Number\s*[:#]\s*(\S+)",
-                r"INV\s*[:#]\s*(\S+)",
-            ],
-            text,
-        )
-
-        # Invoice date
-        invoice_date = self._find_first(
-            [
-                r"Invoice\s*Date\s*[:]\s*([^\n]+)",
-                r"Date\s*[:]\s*([^\n]+)",
-            ],
-            text,
-        )
+        found = self.scanner.scan(text)
 
-        # Due date
-        due_date = self._find_first(
-            [
-                r"Due\s*Date\s*[:]\s*([^\n]+)",
-                r"Payment\s*Due\s*[:]\s*([^\n]+)",
-            ],
-            text,
-        )
+        # Invoice number, dates
+        invoice_number = self._text(found, "invoice_number")
+        invoice_date = self._text(found, "invoice_date")
+        due_date = self._text(found, "due_date")
 
-        # Very naive vendor/customer heuristics
+        # Very naive vendor/customer heuristics, in one walk over the lines:
+        # vendor = first line of the top section that is not the title,
+        # customer = the line after "Bill To" / "Billed To"
         lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
 
         vendor_name = None
         customer_name = None
+        find_vendor = True
+        find_customer = "bill_to" in found
 
-        for i, ln in enumerate(lines[:10]):  # top section for vendor
-            if "invoice" in ln.lower():
-                continue
-            if len(ln.split()) >= 2:
-                vendor_name = ln
-                break
-
-        # Look for "Bill To" or "Ship To" for customer
         for i, ln in enumerate(lines):
-            if re.search(r"Bill To|Billed To", ln, re.IGNORECASE):
+            if find_vendor and i < 10:
+                if "invoice" not in ln.lower() and len(ln.split()) >= 2:
+                    vendor_name = ln
+                    find_vendor = False
+            else:
+                find_vendor = False
+
+            if find_customer and patterns.INVOICE_BILL_TO.search(ln):
                 if i + 1 < len(lines):
                     customer_name = lines[i + 1]
+                find_customer = False
+
+            if not find_vendor and not find_customer:
                 break
 
         # Subtotal, tax, total
-        subtotal_amount = self._find_amount([r"Sub\s*Total", r"Subtotal"], text)
-        tax_amount = self._find_amount([r"Tax", r"GST", r"VAT"], text)
-        total_amount = self._find_amount([r"Total\s*Amount", r"Total\s*Due", r"Amount\s*Due"], text)
+        subtotal_amount = self._amount(found, "subtotal")
+        tax_amount = self._amount(found, "tax")
+        total_amount = self._amount(found, "total")
 
         # Currency guess (look for INR, USD, EUR etc.)
-        currency_match = re.search(r"\b(INR|USD|EUR|GBP|JPY|AUD|CAD)\b", text)
-        currency = currency_match.group(1) if currency_match else None
+        currency = found["currency"].group(1) if "currency" in found else None
 
-        # TODO: parse line items (table parsing from DocAI structure)
-        line_items: List[InvoiceItem] = []
+        # Line items come from the Document AI tables, when available
+        line_items: List[InvoiceItem] = [
+            InvoiceItem(**item) for item in layout_parser.line_items(layout)
+        ]
 
         return InvoiceExtractionResult(
             invoice_number=invoice_number,
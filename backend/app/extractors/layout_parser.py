@@ -0,0 +1,158 @@
+# app/extractors/layout_parser.py
+
+"""
+Line items and key-value pairs from the stored Document AI layout.
+
+The layout is the compact dict written by OCRService._document_layout:
+
+    {
+      "pages": 2,
+      "tables":   [{"page": 1, "header": [["Item", "Qty", ...]], "rows": [[...], ...]}],
+      "fields":   [{"page": 1, "name": "Invoice No:", "value": "INV-1", "confidence": 0.98}],
+      "entities": [{"type": "total_amount", "text": "118.00", "confidence": 0.9}]
+    }
+
+Everything here works on plain lists and strings, so no text scanning
+is needed once Document AI has found the table cells.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+_NUMBER = re.compile(r"-?\d[\d,]*(?:\.\d+)?")
+_KEY = re.compile(r"[^a-z0-9]+")
+
+# Form field labels (normalised) -> extractor field names
+FIELD_ALIASES = {
+    "invoice_no": "invoice_number",
+    "invoice_number": "invoice_number",
+    "invoice": "invoice_number",
+    "invoice_date": "invoice_date",
+    "date_of_invoice": "invoice_date",
+    "due_date": "due_date",
+    "payment_due": "due_date",
+    "bill_to": "customer_name",
+    "billed_to": "customer_name",
+    "subtotal": "subtotal_amount",
+    "sub_total": "subtotal_amount",
+    "tax": "tax_amount",
+    "gst": "tax_amount",
+    "vat": "tax_amount",
+    "total": "total_amount",
+    "total_amount": "total_amount",
+    "total_due": "total_amount",
+    "amount_due": "total_amount",
+    "balance_due": "total_amount",
+    "po_no": "po_number",
+    "po_number": "po_number",
+    "purchase_order_no": "po_number",
+    "po_date": "date",
+    "order_date": "date",
+    "date": "date",
+    "vendor": "vendor",
+    "supplier": "vendor",
+    "name": "full_name",
+    "full_name": "full_name",
+    "id_no": "id_number",
+    "id_number": "id_number",
+    "date_of_birth": "date_of_birth",
+    "dob": "date_of_birth",
+}
+
+
+def normalize_key(name: str) -> str:
+    return _KEY.sub("_", name.lower()).strip("_")
+
+
+def parse_number(value: Optional[str]) -> Optional[float]:
+    """First number in a cell ("$1,200.50" -> 1200.5), or None."""
+    if not value:
+        return None
+    m = _NUMBER.search(value)
+    return float(m.group(0).replace(",", "")) if m else None
+
+
+def _column_role(header: str) -> Optional[str]:
+    h = header.lower()
+    if "qty" in h or "quantity" in h:
+        return "quantity"
+    if "total" in h or "amount" in h:
+        return "total_price"
+    if any(w in h for w in ("price", "rate", "unit", "cost")):
+        return "unit_price"
+    if any(w in h for w in ("desc", "item", "product", "particular", "service", "detail")):
+        return "description"
+    return None
+
+
+def _column_roles(header_rows: List[List[str]]) -> Dict[int, str]:
+    """Column index -> role, from the last header row that names any column."""
+    for header in reversed(header_rows):
+        roles = {}
+        for i, cell in enumerate(header):
+            role = _column_role(cell)
+            if role and role not in roles.values():
+                roles[i] = role
+        if roles:
+            # An unlabelled first column is usually the description
+            if "description" not in roles.values() and header and 0 not in roles:
+                roles[0] = "description"
+            return roles
+    return {}
+
+
+def line_items(layout: Optional[dict], parse: bool = True) -> List[dict]:
+    """
+    Rows of every table that looks like a line-item table, as dicts with
+    description / quantity / unit_price / total_price. Numeric cells are
+    parsed to floats unless parse=False. A table qualifies when it has a
+    description column and at least one numeric column.
+    """
+    if not layout:
+        return []
+
+    items = []
+    for table in layout.get("tables", []):
+        roles = _column_roles(table.get("header", []))
+        if "description" not in roles.values() or len(roles) < 2:
+            continue
+
+        for row in table.get("rows", []):
+            item = {"description": None, "quantity": None, "unit_price": None, "total_price": None}
+            for i, role in roles.items():
+                cell = row[i] if i < len(row) else ""
+                if role == "description" or not parse:
+                    item[role] = cell or None
+                else:
+                    item[role] = parse_number(cell)
+
+            # Skip spacer rows and repeated totals with no description
+            if item["description"] and any(item[k] is not None for k in item if k != "description"):
+                items.append(item)
+
+    return items
+
+
+def key_values(layout: Optional[dict], min_confidence: float = 0.0) -> Dict[str, str]:
+    """
+    Form fields as {normalised label: value}; the first occurrence wins.
+    """
+    if not layout:
+        return {}
+
+    pairs = {}
+    for field in layout.get("fields", []):
+        if field.get("confidence", 1.0) < min_confidence or not field.get("value"):
+            continue
+        pairs.setdefault(normalize_key(field.get("name", "")), field["value"])
+    return pairs
+
+
+def known_fields(layout: Optional[dict], min_confidence: float = 0.5) -> Dict[str, str]:
+    """key_values() mapped onto extractor field names via FIELD_ALIASES."""
+    fields = {}
+    for key, value in key_values(layout, min_confidence).items():
+        name = FIELD_ALIASES.get(key)
+        if name:
+            fields.setdefault(name, value)
+    return fields
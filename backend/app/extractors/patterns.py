@@ -0,0 +1,137 @@
+# app/extractors/patterns.py
+
+"""
+Shared registry of precompiled regex patterns for the rule-based extractors.
+
+Every pattern is compiled once at import time. Extractors refer to them by
+name instead of handing raw strings to re.search on each call.
+Ordered tuples are tried first to last (first match wins).
+"""
+
+import re
+from typing import Optional, Pattern, Sequence
+
+_I = re.IGNORECASE
+
+# --------------------------------------------
+# Shared fragments
+# --------------------------------------------
+AMOUNT = r"([A-Z]{3})?\s?(\d{1,3}(?:[,\d]{3})*(?:\.\d+)?)"
+DMY_DATE = r"([0-9]{1,2}[-/][0-9]{1,2}[-/][0-9]{2,4})"
+
+
+def _amount_after(label: str) -> Pattern:
+    """Label, optional ':' / spaces, optional currency code, then a number."""
+    return re.compile(rf"{label}[:\s]*{AMOUNT}", _I)
+
+
+CURRENCY_CODE = re.compile(r"\b(INR|USD|EUR|GBP|JPY|AUD|CAD)\b")
+
+# --------------------------------------------
+# Invoice
+# --------------------------------------------
+INVOICE_NUMBER = (
+    re.compile(r"Invoice\s*No\.?\s*[:#]\s*(\S+)", _I),
+    re.compile(r"Invoice\s*Number\s*[:#]\s*(\S+)", _I),
+    re.compile(r"INV\s*[:#]\s*(\S+)", _I),
+)
+INVOICE_DATE = (
+    re.compile(r"Invoice\s*Date\s*[:]\s*([^\n]+)", _I),
+    re.compile(r"Date\s*[:]\s*([^\n]+)", _I),
+)
+INVOICE_DUE_DATE = (
+    re.compile(r"Due\s*Date\s*[:]\s*([^\n]+)", _I),
+    re.compile(r"Payment\s*Due\s*[:]\s*([^\n]+)", _I),
+)
+INVOICE_BILL_TO = re.compile(r"Bill To|Billed To", _I)
+INVOICE_SUBTOTAL = (_amount_after(r"Sub\s*Total"), _amount_after(r"Subtotal"))
+INVOICE_TAX = (_amount_after(r"Tax"), _amount_after(r"GST"), _amount_after(r"VAT"))
+INVOICE_TOTAL = (
+    _amount_after(r"Total\s*Amount"),
+    _amount_after(r"Total\s*Due"),
+    _amount_after(r"Amount\s*Due"),
+)
+# Leading keyword of every invoice pattern above (and CURRENCY_CODE), for
+# the single-pass FieldScanner. Keep in sync when adding invoice patterns.
+INVOICE_KEYWORDS = (
+    "inv", "date", "due", "payment", "sub", "tax", "gst", "vat", "total",
+    "amount", "bill", "inr", "usd", "eur", "gbp", "jpy", "aud", "cad",
+)
+
+# --------------------------------------------
+# Receipt
+# --------------------------------------------
+RECEIPT_DATE = (
+    re.compile(rf"Date[:\s]*{DMY_DATE}", _I),
+    re.compile(DMY_DATE, _I),
+)
+RECEIPT_TIME = (
+    re.compile(r"Time[:\s]*([0-9]{1,2}:[0-9]{2}(?::[0-9]{2})?\s*(?:AM|PM)?)", _I),
+    re.compile(r"([0-9]{1,2}:[0-9]{2}(?::[0-9]{2})?\s*(?:AM|PM)?)", _I),
+)
+RECEIPT_PAYMENT_METHOD = (
+    re.compile(r"Payment\s*Method[:\s]*([A-Za-z ]+)", _I),
+    re.compile(r"(CASH|CARD|UPI|DEBIT|CREDIT)", _I),
+)
+RECEIPT_TOTAL = re.compile(r"Total\s*(?:Amount)?[:\s]*" + AMOUNT, _I)
+
+# --------------------------------------------
+# ID card
+# --------------------------------------------
+ID_NUMBER = (
+    re.compile(r"ID\s*No\.?[:\s]*([A-Z0-9\-]+)", _I),
+    re.compile(r"ID\s*Number[:\s]*([A-Z0-9\-]+)", _I),
+    re.compile(r"Number[:\s]*([A-Z0-9\-]{6,})", _I),
+)
+ID_FULL_NAME = (
+    re.compile(r"Name[:\s]*([^\n]+)", _I),
+    re.compile(r"Full\s*Name[:\s]*([^\n]+)", _I),
+)
+ID_DATE_OF_BIRTH = (
+    re.compile(rf"DOB[:\s]*{DMY_DATE}", _I),
+    re.compile(rf"Date\s*of\s*Birth[:\s]*{DMY_DATE}", _I),
+)
+ID_ISSUE_DATE = (
+    re.compile(rf"Issue\s*Date[:\s]*{DMY_DATE}", _I),
+    re.compile(rf"Issued\s*On[:\s]*{DMY_DATE}", _I),
+)
+ID_EXPIRY_DATE = (
+    re.compile(rf"Expiry\s*Date[:\s]*{DMY_DATE}", _I),
+    re.compile(rf"Valid\s*Till[:\s]*{DMY_DATE}", _I),
+)
+ID_ADDRESS = (
+    re.compile(r"Address[:\s]*([^\n]+)", _I),
+)
+# Checked in order; first hit decides the ID type
+ID_TYPES = (
+    ("passport", re.compile(r"Passport", _I)),
+    ("driving_license", re.compile(r"Driving\s*Licence|Driver's\s*License", _I)),
+    ("aadhaar", re.compile(r"Aadhar|Aadhaar", _I)),
+    ("pan_card", re.compile(r"PAN\s*Card", _I)),
+)
+
+# --------------------------------------------
+# Purchase order
+# --------------------------------------------
+PO_LETTER = re.compile(r"[A-Za-z]")
+PO_NUMBER = re.compile(r"(PO|P\.O)\s*[:\-]?\s*(\w+)", _I)
+PO_DATE = re.compile(r"(\d{2}[\/\-]\d{2}[\/\-]\d{4})|(\d{4}[\/\-]\d{2}[\/\-]\d{2})")
+PO_LINE_ITEM = re.compile(
+    r"(?P<desc>[A-Za-z0-9 ,.\-/]+)\s+"
+    r"(?P<qty>\d+(?:\.\d+)?)\s+"
+    r"(?P<unit>\d+(?:\.\d+)?)\s+"
+    r"(?P<total>\d+(?:\.\d+)?)"
+)
+
+
+# --------------------------------------------
+# Helpers
+# --------------------------------------------
+def find_first(patterns: Sequence[Pattern], text: str, group: int = 1) -> Optional[str]:
+    """Stripped capture group of the first pattern that matches."""
+    for p in patterns:
+        m = p.search(text)
+        if m:
+            return m.group(group).strip()
+    return None
+
@@ -1,9 +1,9 @@
 # app/extractors/po_extractor.py
 
-import re
 from typing import List, Optional
 from pydantic import BaseModel
 
+from app.extractors import layout_parser, patterns
 from app.utils.text_utils import basic_clean_text
 
 
@@ -32,9 +32,11 @@ class POExtractionResult(BaseModel):
 
 class POExtractor:
 
-    def extract(self, text: str) -> POExtractionResult:
+    def extract(self, text: str, layout: Optional[dict] = None) -> POExtractionResult:
         """
         Extracts purchase order fields from OCR text.
+        Line items are read from the Document AI tables in layout when it
+        has any; the regex scan is only the fallback.
         """
 
         cleaned = basic_clean_text(text)
@@ -47,7 +49,7 @@ class POExtractor:
         lines = cleaned.split("\n")
 
         for line in lines[:5]:
-            if len(line.strip()) > 3 and re.search(r"[A-Za-z]", line):
+            if len(line.strip()) > 3 and patterns.PO_LETTER.search(line):
                 vendor = line.strip()
                 break
 
@@ -55,7 +57,7 @@ class POExtractor:
         # 2. PO NUMBER
         # ------------------------------------------------------
         po_number = None
-        po_match = re.search(r"(PO|P\.O)\s*[:\-]?\s*(\w+)", cleaned, re.IGNORECASE)
+        po_match = patterns.PO_NUMBER.search(cleaned)
         if po_match:
             po_number = po_match.group(2).strip()
 
@@ -63,35 +65,28 @@ class POExtractor:
         # 3. DATE
         # ------------------------------------------------------
         date = None
-        date_match = re.search(
-            r"(\d{2}[\/\-]\d{2}[\/\-]\d{4})|(\d{4}[\/\-]\d{2}[\/\-]\d{2})",
-            cleaned
-        )
+        date_match = patterns.PO_DATE.search(cleaned)
         if date_match:
             date = date_match.group(0)
 
         # ------------------------------------------------------
-        # 4. LINE ITEMS (Regex block extraction)
+        # 4. LINE ITEMS (Document AI tables, else regex fallback)
         # ------------------------------------------------------
-        line_items: List[POLineItem] = []
-
-        # Basic heuristic: look for numerical patterns
-        line_regex = re.compile(
-            r"(?P<desc>[A-Za-z0-9 ,.\-/]+)\s+"
-            r"(?P<qty>\d+(?:\.\d+)?)\s+"
-            r"(?P<unit>\d+(?:\.\d+)?)\s+"
-            r"(?P<total>\d+(?:\.\d+)?)"
-        )
-
-        for match in line_regex.finditer(cleaned):
-            line_items.append(
-                POLineItem(
-                    description=match.group("desc").strip(),
-                    quantity=match.group("qty"),
-                    unit_price=match.group("unit"),
-                    total_price=match.group("total"),
+        line_items: List[POLineItem] = [
+            POLineItem(**item) for item in layout_parser.line_items(layout, parse=False)
+        ]
+
+        # No table found: look for "description qty unit total" rows
+        if not line_items:
+            for match in patterns.PO_LINE_ITEM.finditer(cleaned):
+                line_items.append(
+                    POLineItem(
+                        description=match.group("desc").strip(),
+                        quantity=match.group("qty"),
+                        unit_price=match.group("unit"),
+                        total_price=match.group("total"),
+                    )
                 )
-            )
 
         return POExtractionResult(
             vendor=vendor,
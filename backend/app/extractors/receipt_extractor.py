@@ -1,9 +1,10 @@
 # app/extractors/receipt_extractor.py
 
-import re
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
+from app.extractors import layout_parser, patterns
+
 
 class ReceiptItem(BaseModel):
     description: Optional[str] = None
@@ -30,17 +31,7 @@ class ReceiptExtractor:
     Rule-based receipt extractor.
     """
 
-    def __init__(self):
-        self.money_pattern = re.compile(r"(\d{1,3}(?:[,\d]{3})*(?:\.\d+)?)")
-
-    def _find_first(self, patterns, text: str) -> Optional[str]:
-        for p in patterns:
-            m = re.search(p, text, re.IGNORECASE)
-            if m:
-                return m.group(1).strip()
-        return None
-
-    def extract(self, text: str) -> ReceiptExtractionResult:
+    def extract(self, text: str, layout: Optional[dict] = None) -> ReceiptExtractionResult:
         if not text:
             return ReceiptExtractionResult(raw_text="")
 
@@ -49,38 +40,16 @@ class ReceiptExtractor:
         merchant_name = lines[0] if lines else None
 
         # Date & time
-        receipt_date = self._find_first(
-            [
-                r"Date[:\s]*([0-9]{1,2}[-/][0-9]{1,2}[-/][0-9]{2,4})",
-                r"([0-9]{1,2}[-/][0-9]{1,2}[-/][0-9]{2,4})",
-            ],
-            text,
-        )
+        receipt_date = patterns.find_first(patterns.RECEIPT_DATE, text)
 
-        receipt_time = self._find_first(
-            [
-                r"Time[:\s]*([0-9]{1,2}:[0-9]{2}(?::[0-9]{2})?\s*(?:AM|PM)?)",
-                r"([0-9]{1,2}:[0-9]{2}(?::[0-9]{2})?\s*(?:AM|PM)?)",
-            ],
-            text,
-        )
+        receipt_time = patterns.find_first(patterns.RECEIPT_TIME, text)
 
         # Payment method
-        payment_method = self._find_first(
-            [
-                r"Payment\s*Method[:\s]*([A-Za-z ]+)",
-                r"(CASH|CARD|UPI|DEBIT|CREDIT)",
-            ],
-            text,
-        )
+        payment_method = patterns.find_first(patterns.RECEIPT_PAYMENT_METHOD, text)
 
         # Total amount
         total_amount = None
-        total_match = re.search(
-            r"Total\s*(?:Amount)?[:\s]*([A-Z]{3})?\s?(\d{1,3}(?:[,\d]{3})*(?:\.\d+)?)",
-            text,
-            re.IGNORECASE,
-        )
+        total_match = patterns.RECEIPT_TOTAL.search(text)
         currency = None
         if total_match:
             currency = total_match.group(1)
@@ -90,11 +59,13 @@ class ReceiptExtractor:
                 total_amount = None
 
         if not currency:
-            c_match = re.search(r"\b(INR|USD|EUR|GBP|JPY|AUD|CAD)\b", text)
+            c_match = patterns.CURRENCY_CODE.search(text)
             currency = c_match.group(1) if c_match else None
 
-        # TODO: parse items – for now we leave as empty.
-        items: List[ReceiptItem] = []
+        # Items come from the Document AI tables, when available
+        items: List[ReceiptItem] = [
+            ReceiptItem(**item) for item in layout_parser.line_items(layout)
+        ]
 
         return ReceiptExtractionResult(
             merchant_name=merchant_name,
@@ -0,0 +1,73 @@
+# app/extractors/scanner.py
+
+"""
+Single-pass multi-field regex scanner.
+
+Instead of one re.search over the whole text per pattern, a keyword
+anchor walks the text once and stops only where some field pattern could
+begin. Unresolved field patterns are tried at those positions with
+Pattern.match(text, pos).
+
+Semantics match calling find_first(patterns, text) per field: the first
+pattern in a field's list that matches anywhere wins, at its leftmost
+match. This needs one invariant: every field pattern must begin with one
+of the scanner's keywords (case-insensitive).
+"""
+
+import re
+from typing import Dict, Match, Pattern, Sequence
+
+# Non-ASCII characters that IGNORECASE treats as equal to an ASCII letter
+# (or whose lowercase changes length). If any appear, the lowercased fast
+# path could disagree with the patterns, so the scanner falls back.
+_UNSAFE_FOLD = re.compile("[ſKıİ]")
+
+
+class FieldScanner:
+
+    def __init__(self, keywords: Sequence[str], fields: Dict[str, Sequence[Pattern]]):
+        alternation = "|".join(re.escape(k.lower()) for k in keywords)
+
+        # Zero-width so overlapping keywords ("invat" -> inv, vat) all fire.
+        # The fast anchor runs case-sensitively over text.lower().
+        self.anchor = re.compile(rf"(?={alternation})", re.IGNORECASE)
+        self.fast_anchor = re.compile(rf"(?={alternation})")
+        self.fields = fields
+
+    def scan(self, text: str) -> Dict[str, Match]:
+        """
+        Returns:
+            field name -> winning match, for fields that matched
+        """
+        if _UNSAFE_FOLD.search(text):
+            anchors = self.anchor.finditer(text)
+        else:
+            anchors = self.fast_anchor.finditer(text.lower())
+
+        # Per field, the patterns that could still win, in priority order
+        pending = {name: list(patterns) for name, patterns in self.fields.items()}
+        found: Dict[str, Match] = {}
+
+        for anchor in anchors:
+            pos = anchor.start()
+
+            for name in list(pending):
+                candidates = pending[name]
+
+                for i, pattern in enumerate(candidates):
+                    m = pattern.match(text, pos)
+                    if not m:
+                        continue
+
+                    # Leftmost match of this pattern; lower-priority patterns
+                    # can no longer win, higher-priority ones still can.
+                    found[name] = m
+                    del candidates[i:]
+                    if not candidates:
+                        del pending[name]
+                    break
+
+            if not pending:
+                break
+
+        return found
@@ -1,8 +1,24 @@
+import asyncio
 import os
 import json
+import numpy as np
 from google import genai
-from google.genai.types import GenerateContentConfig
+from google.genai.types import GenerateContentConfig, HttpOptions
 from app.services.cache_service import cache_service
+from app.nlp.preprocess import preprocessor, estimate_tokens
+from app.nlp.clean_text import clean_text
+from app.nlp.chunking import chunk_text
+from app.utils.logger import get_logger
+from app.utils.metrics import record_gemini_error
+from app.llm.gemini_prompts import (
+    classify_prompt,
+    summarize_prompt,
+    extract_prompt,
+    extract_fields_prompt,
+    classify_extract_prompt,
+)
+
+logger = get_logger(__name__)
 
 
 class GeminiClient:
@@ -11,10 +27,21 @@ class GeminiClient:
         if not api_key:
             raise RuntimeError("Missing GEMINI_API_KEY environment variable")
 
-        self.client = genai.Client(api_key=api_key)
+        # Optional override so load tests can point at a local stand-in server
+        base_url = os.getenv("GEMINI_BASE_URL")
+        http_options = HttpOptions(base_url=base_url) if base_url else None
+
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
         self.model = "models/gemini-2.5-flash"
         self.embed_model = "models/text-embedding-004"
 
+        # embed_content accepts at most this many contents per request
+        self.embed_batch_size = int(os.getenv("GEMINI_EMBED_BATCH_SIZE", "100"))
+        self.embed_concurrency = int(os.getenv("GEMINI_EMBED_CONCURRENCY", "4"))
+
+        # Opt-in: classify + extract in one prompt (see classify_and_extract_async)
+        self.combined_mode = os.getenv("GEMINI_COMBINED_MODE", "false").lower() in ("1", "true", "yes")
+
     def classify_document(self, text: str) -> dict:
         """
         Classify document with intelligent caching.
@@ -23,33 +50,14 @@ class GeminiClient:
 
         # ✅ CHECK CACHE FIRST
         cached = cache_service.get(text, "classify")
-        if cached:
+        if cached is not None:
             return cached
 
         # ❌ CACHE MISS - Call Gemini API
-        prompt = f"""
-        Classify this document into:
-        - invoice
-        - receipt
-        - purchase_order
-        - resume
-        - report
-        - unknown
-
-        Respond ONLY in JSON including:
-        {{
-            "document_type": "...",
-            "confidence": 0.xx
-        }}
-
-        TEXT:
-        {text}
-        """
-
         try:
             response = self.client.models.generate_content(
                 model=self.model,
-                contents=[prompt],
+                contents=[classify_prompt(preprocessor.prepare(text, "classify"))],
                 config=GenerateContentConfig(
                     response_mime_type="application/json"
                 )
@@ -63,7 +71,8 @@ class GeminiClient:
             return result
 
         except Exception as e:
-            print(f"⚠️ Gemini API error: {e}")
+            logger.warning("gemini_error", extra={"operation": "classify", "error": str(e)})
+            record_gemini_error("classify")
             return {"document_type": "unknown", "confidence": 0.0}
 
     def summarize(self, text: str) -> str:
@@ -73,14 +82,14 @@ class GeminiClient:
 
         # ✅ CHECK CACHE FIRST
         cached = cache_service.get(text, "summarize")
-        if cached:
+        if cached is not None:
             return cached.get("summary", "")
 
         # ❌ CACHE MISS - Call API
         try:
             response = self.client.models.generate_content(
                 model=self.model,
-                contents=[f"Summarize this document concisely:\n{text}"]
+                contents=[summarize_prompt(preprocessor.prepare(text, "summarize"))]
             )
 
             summary = response.text
@@ -91,7 +100,8 @@ class GeminiClient:
             return summary
 
         except Exception as e:
-            print(f"⚠️ Gemini API error: {e}")
+            logger.warning("gemini_error", extra={"operation": "summarize", "error": str(e)})
+            record_gemini_error("summarize")
             return "Summary unavailable"
 
     def generate_embeddings(self, text: str):
@@ -101,14 +111,14 @@ class GeminiClient:
 
         # ✅ CHECK CACHE FIRST
         cached = cache_service.get(text, "embeddings")
-        if cached:
+        if cached is not None:
             return cached.get("values", [])
 
         # ❌ CACHE MISS - Call API
         try:
             resp = self.client.models.embed_content(
                 model=self.embed_model,
-                contents=[text]
+                contents=[preprocessor.prepare(text, "embeddings")]
             )
 
             values = resp.embeddings[0].values
@@ -119,9 +129,26 @@ class GeminiClient:
             return values
 
         except Exception as e:
-            print(f"⚠️ Gemini API error: {e}")
+            logger.warning("gemini_error", extra={"operation": "embeddings", "error": str(e)})
+            record_gemini_error("embeddings")
             return []
 
+    def _cached_embeddings(self, texts: list):
+        """(results with None for misses, distinct non-empty miss texts)."""
+        cached = cache_service.get_many(texts, "embeddings")
+        results = [c.get("values", []) if c else None for c in cached]
+        misses = list(dict.fromkeys(
+            t for t, r in zip(texts, results) if r is None and t.strip()
+        ))
+        return results, misses
+
+    def _fill_embeddings(self, texts: list, results: list, embedded: dict) -> list:
+        if embedded:
+            cache_service.set_many(
+                list(embedded), "embeddings", [{"values": v} for v in embedded.values()]
+            )
+        return [r if r is not None else embedded.get(t, []) for t, r in zip(texts, results)]
+
     def extract_structured(self, text: str, doc_type: str):
         """
         Extract structured data with caching.
@@ -133,22 +160,14 @@ class GeminiClient:
 
         # ✅ CHECK CACHE FIRST
         cached = cache_service.get(cache_text, "extract")
-        if cached:
+        if cached is not None:
             return cached
 
         # ❌ CACHE MISS - Call API
-        prompt = f"""
-Extract structured fields from this {doc_type} document.
-Return ONLY valid JSON. No explanations.
-
-Document:
-{text}
-"""
-
         try:
             response = self.client.models.generate_content(
                 model=self.model,
-                contents=[prompt],
+                contents=[extract_prompt(preprocessor.prepare(text, "extract"), doc_type)],
                 config=genai.types.GenerateContentConfig(
                     response_mime_type="application/json"
                 )
@@ -162,8 +181,237 @@ Document:
             return result
 
         except Exception as e:
-            print(f"⚠️ Gemini API error: {e}")
+            logger.warning("gemini_error", extra={"operation": "extract", "error": str(e)})
+            record_gemini_error("extract")
             return {"raw_text": text}
 
+    def _cache_combined(self, text: str, data: dict):
+        """
+        Split a combined response and cache each half under its own
+        operation, so later classify / extract calls for the text hit.
+        """
+        classified = {
+            "document_type": data.get("document_type", "unknown"),
+            "confidence": data.get("confidence", 0.0),
+        }
+        cache_service.set(text, "classify", classified)
+
+        # No "fields" in the response: leave extraction to the caller.
+        # An empty dict is a valid (cached) extraction.
+        extraction = data.get("fields")
+        if extraction is not None:
+            cache_service.set(f"{classified['document_type']}|{text}", "extract", extraction)
+
+        return classified, extraction
+
+    # ------------------------------------------
+    # ASYNC API (non-blocking, for FastAPI routes)
+    # ------------------------------------------
+    # Same caching and fallbacks as the sync methods above, but the network
+    # call goes through genai's asyncio client so the event loop stays free.
+
+    async def classify_document_async(self, text: str) -> dict:
+        cached = cache_service.get(text, "classify")
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=[classify_prompt(preprocessor.prepare(text, "classify"))],
+                config=GenerateContentConfig(
+                    response_mime_type="application/json"
+                )
+            )
+
+            result = json.loads(response.text)
+            cache_service.set(text, "classify", result)
+            return result
+
+        except Exception as e:
+            logger.warning("gemini_error", extra={"operation": "classify", "error": str(e)})
+            record_gemini_error("classify")
+            return {"document_type": "unknown", "confidence": 0.0}
+
+    async def summarize_async(self, text: str) -> str:
+        cached = cache_service.get(text, "summarize")
+        if cached is not None:
+            return cached.get("summary", "")
+
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=[summarize_prompt(preprocessor.prepare(text, "summarize"))]
+            )
+
+            summary = response.text
+            cache_service.set(text, "summarize", {"summary": summary})
+            return summary
+
+        except Exception as e:
+            logger.warning("gemini_error", extra={"operation": "summarize", "error": str(e)})
+            record_gemini_error("summarize")
+            return "Summary unavailable"
+
+    async def generate_embeddings_batch_async(self, texts: list) -> list:
+        """
+        Embeddings for many texts, in input order.
+
+        Every text is looked up in the cache in one pass; only the misses
+        are sent, GEMINI_EMBED_BATCH_SIZE per embed_content call, and all
+        new vectors are written back in one bulk cache write. A failed
+        chunk leaves [] for its texts.
+        """
+
+        results, misses = self._cached_embeddings(texts)
+
+        # Chunks go out concurrently, at most GEMINI_EMBED_CONCURRENCY at a time
+        limit = asyncio.Semaphore(self.embed_concurrency)
+
+        async def embed_chunk(chunk):
+            async with limit:
+                try:
+                    resp = await self.client.aio.models.embed_content(
+                        model=self.embed_model,
+                        contents=[preprocessor.prepare(t, "embeddings") for t in chunk]
+                    )
+                    return dict(zip(chunk, (e.values for e in resp.embeddings)))
+
+                except Exception as e:
+                    logger.warning("gemini_error", extra={"operation": "embeddings", "error": str(e)})
+                    record_gemini_error("embeddings")
+                    return {}
+
+        chunks = [
+            misses[i:i + self.embed_batch_size]
+            for i in range(0, len(misses), self.embed_batch_size)
+        ]
+        embedded = {}
+        for part in await asyncio.gather(*(embed_chunk(c) for c in chunks)):
+            embedded.update(part)
+
+        return self._fill_embeddings(texts, results, embedded)
+
+    async def generate_document_embeddings_async(self, text: str) -> dict:
+        """
+        Document embedding: the cleaned text is split into overlapping
+        chunks (see app/nlp/chunking.py), embedded in batches with each
+        chunk cached on its own, and pooled. A short document is a single
+        chunk. This is the vector kept in the embedding store.
+
+        Returns:
+            {"vector": pooled, "chunks": [{"index", "tokens", "vector"}],
+             "failed_chunks": n}
+        """
+        return (await self.generate_documents_embeddings_async([text]))[0]
+
+    async def generate_documents_embeddings_async(self, texts: list) -> list:
+        """generate_document_embeddings_async for many documents, with all chunks in one batch."""
+        chunked = [chunk_text(clean_text(text)) for text in texts]
+        vectors = await self.generate_embeddings_batch_async([c for chunks in chunked for c in chunks])
+
+        results, start = [], 0
+        for chunks in chunked:
+            results.append(_pool_chunks(chunks, vectors[start:start + len(chunks)]))
+            start += len(chunks)
+        return results
+
+    async def extract_structured_async(self, text: str, doc_type: str):
+        cache_text = f"{doc_type}|{text}"
+
+        cached = cache_service.get(cache_text, "extract")
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=[extract_prompt(preprocessor.prepare(text, "extract"), doc_type)],
+                config=GenerateContentConfig(
+                    response_mime_type="application/json"
+                )
+            )
+
+            result = json.loads(response.text)
+            cache_service.set(cache_text, "extract", result)
+            return result
+
+        except Exception as e:
+            logger.warning("gemini_error", extra={"operation": "extract", "error": str(e)})
+            record_gemini_error("extract")
+            return {"raw_text": text}
+
+    async def extract_fields_async(self, text: str, doc_type: str, fields: list) -> dict:
+        """
+        Extract only the named fields; used to fill gaps left by the
+        rule-based extractors. Returns {} on error.
+        """
+
+        cache_text = f"{doc_type}|{','.join(fields)}|{text}"
+
+        cached = cache_service.get(cache_text, "extract_fields")
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=[extract_fields_prompt(preprocessor.prepare(text, "extract"), doc_type, fields)],
+                config=GenerateContentConfig(
+                    response_mime_type="application/json"
+                )
+            )
+
+            result = json.loads(response.text)
+            cache_service.set(cache_text, "extract_fields", result)
+            return result
+
+        except Exception as e:
+            logger.warning("gemini_error", extra={"operation": "extract_fields", "error": str(e)})
+            record_gemini_error("extract_fields")
+            return {}
+
+    async def classify_and_extract_async(self, text: str):
+        classified = cache_service.get(text, "classify")
+        if classified is not None:
+            extraction = await self.extract_structured_async(text, classified.get("document_type"))
+            return classified, extraction
+
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=[classify_extract_prompt(preprocessor.prepare(text, "extract"))],
+                config=GenerateContentConfig(
+                    response_mime_type="application/json"
+                )
+            )
+
+            return self._cache_combined(text, json.loads(response.text))
+
+        except Exception as e:
+            logger.warning("gemini_error", extra={"operation": "classify_extract", "error": str(e)})
+            record_gemini_error("classify_extract")
+            return {"document_type": "unknown", "confidence": 0.0}, {"raw_text": text}
+
+
+def _pool_chunks(chunks: list, vectors: list) -> dict:
+    """Token-weighted mean of the chunk vectors, L2-normalised."""
+    parts = [
+        {"index": i, "tokens": estimate_tokens(chunk), "vector": vector}
+        for i, (chunk, vector) in enumerate(zip(chunks, vectors))
+    ]
+    good = [p for p in parts if p["vector"]]
+
+    pooled = []
+    if good:
+        matrix = np.asarray([p["vector"] for p in good], dtype=np.float32)
+        weights = np.asarray([p["tokens"] for p in good], dtype=np.float32)
+        mean = weights @ matrix / weights.sum()
+        norm = np.linalg.norm(mean)
+        pooled = (mean / norm if norm > 0 else mean).tolist()
+
+    return {"vector": pooled, "chunks": parts, "failed_chunks": len(parts) - len(good)}
+
 
-gemini = GeminiClient()
\ No newline at end of file
+# Singleton instance
+gemini = GeminiClient()
@@ -0,0 +1,79 @@
+# app/llm/gemini_prompts.py
+
+"""
+Prompt templates shared by the sync and async Gemini code paths.
+"""
+
+DOCUMENT_TYPES = [
+    "invoice",
+    "receipt",
+    "purchase_order",
+    "resume",
+    "report",
+    "unknown",
+]
+
+
+def classify_prompt(text: str) -> str:
+    types = "\n".join(f"        - {t}" for t in DOCUMENT_TYPES)
+    return f"""
+        Classify this document into:
+{types}
+
+        Respond ONLY in JSON including:
+        {{
+            "document_type": "...",
+            "confidence": 0.xx
+        }}
+
+        TEXT:
+        {text}
+        """
+
+
+def summarize_prompt(text: str) -> str:
+    return f"Summarize this document concisely:\n{text}"
+
+
+def extract_prompt(text: str, doc_type: str) -> str:
+    return f"""
+Extract structured fields from this {doc_type} document.
+Return ONLY valid JSON. No explanations.
+
+Document:
+{text}
+"""
+
+
+def extract_fields_prompt(text: str, doc_type: str, fields: list) -> str:
+    keys = ",\n".join(f'    "{f}": ...' for f in fields)
+    return f"""
+Extract ONLY these fields from this {doc_type} document.
+Use null for any field that is not present.
+
+Return ONLY valid JSON. No explanations:
+{{
+{keys}
+}}
+
+Document:
+{text}
+"""
+
+
+def classify_extract_prompt(text: str) -> str:
+    types = ", ".join(DOCUMENT_TYPES)
+    return f"""
+Classify this document as one of: {types}.
+Then extract its structured fields.
+
+Return ONLY valid JSON. No explanations:
+{{
+    "document_type": "...",
+    "confidence": 0.xx,
+    "fields": {{ ... }}
+}}
+
+Document:
+{text}
+"""
@@ -8,3 +8,4 @@ class DetectResponse(BaseModel):
     file_id: str
     document_type: str
     confidence: float
+    classified_by: Optional[str] = None
@@ -0,0 +1,10 @@
+# app/models/embeddings_model.py
+
+from typing import List
+from pydantic import BaseModel
+
+
+class EmbeddingBatchRequest(BaseModel):
+    # Raw texts, and/or uploaded documents whose OCR text should be embedded
+    texts: List[str] = []
+    file_ids: List[str] = []
@@ -1,7 +1,14 @@
 # app/models/ocr_response.py
 
+from typing import List, Optional
 from pydantic import BaseModel
 
 class OCRResponse(BaseModel):
     file_id: str
     text: str
+    deduplicated: bool = False
+    # 1-based pages sent to Document AI / read from the PDF's text layer
+    ocr_pages: Optional[List[int]] = None
+    text_layer_pages: Optional[List[int]] = None
+    # Earlier upload this text nearly matches: {"file_id", "score"}
+    near_duplicate: Optional[dict] = None
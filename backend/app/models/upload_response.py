@@ -5,3 +5,4 @@ from pydantic import BaseModel
 class UploadResponse(BaseModel):
     file_id: str
     filename: str
+    deduplicated: bool = False
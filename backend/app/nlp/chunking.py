@@ -0,0 +1,96 @@
+# app/nlp/chunking.py
+
+"""
+Split long documents into overlapping, token-bounded chunks for embedding.
+
+Boundaries are content-defined: once a chunk holds min_tokens, it ends
+after the first line whose hash hits 1 in `divisor`, or when the next
+line would exceed max_tokens. Because cut points depend on the lines
+themselves rather than on absolute offsets, editing one page moves the
+boundaries around that page only; the other chunks come out identical
+and hit the embedding cache.
+
+Each chunk after the first starts with the last ~overlap tokens of lines
+from the previous one, so text near a boundary is seen in context.
+"""
+
+import os
+import zlib
+from typing import List
+
+from app.nlp.preprocess import estimate_tokens
+
+MAX_TOKENS = int(os.getenv("EMBED_CHUNK_TOKENS", "512"))
+MIN_TOKENS = int(os.getenv("EMBED_CHUNK_MIN_TOKENS", "256"))
+OVERLAP_TOKENS = int(os.getenv("EMBED_CHUNK_OVERLAP", "64"))
+BOUNDARY_DIVISOR = 8
+
+
+def _split_long_line(line: str, max_tokens: int) -> List[str]:
+    """Break a line longer than max_tokens at word boundaries."""
+    pieces, current = [], []
+    for word in line.split(" "):
+        if current and estimate_tokens(" ".join(current + [word])) > max_tokens:
+            pieces.append(" ".join(current))
+            current = []
+        current.append(word)
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def _is_boundary(line: str) -> bool:
+    return zlib.crc32(line.encode()) % BOUNDARY_DIVISOR == 0
+
+
+def chunk_text(
+    text: str,
+    max_tokens: int = MAX_TOKENS,
+    min_tokens: int = MIN_TOKENS,
+    overlap: int = OVERLAP_TOKENS,
+) -> List[str]:
+    """
+    Chunks of text (already cleaned). Each holds at most max_tokens of
+    its own lines plus up to overlap tokens carried from the previous one.
+    """
+    lines = []
+    for line in text.split("\n"):
+        if estimate_tokens(line) > max_tokens:
+            lines.extend(_split_long_line(line, max_tokens))
+        elif line:
+            lines.append(line)
+
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    tokens = 0
+
+    for line in lines:
+        n = estimate_tokens(line) + 1
+        if current and tokens + n > max_tokens:
+            chunks.append(current)
+            current, tokens = [], 0
+
+        current.append(line)
+        tokens += n
+
+        if tokens >= min_tokens and _is_boundary(line):
+            chunks.append(current)
+            current, tokens = [], 0
+
+    if current:
+        chunks.append(current)
+
+    # Prefix each chunk with the tail of the previous one
+    out = []
+    for i, chunk in enumerate(chunks):
+        prefix: List[str] = []
+        if i and overlap > 0:
+            budget = overlap
+            for line in reversed(chunks[i - 1]):
+                budget -= estimate_tokens(line) + 1
+                if budget < 0:
+                    break
+                prefix.insert(0, line)
+        out.append("\n".join(prefix + chunk))
+
+    return out
@@ -0,0 +1,62 @@
+# app/nlp/clean_text.py
+
+import re
+from collections import Counter
+
+from app.utils.text_utils import basic_clean_text
+
+# "Page 3", "Page 3 of 10", "3 / 10", "- 3 -"
+PAGE_NUMBER_LINE = re.compile(
+    r"^(?:page\s*\d+(?:\s*(?:of|/)\s*\d+)?|\d+\s*(?:of|/)\s*\d+|-\s*\d+\s*-)$",
+    re.IGNORECASE,
+)
+
+# Shorter lines are usually table cells or labels, not running headers
+MIN_BOILERPLATE_CHARS = 12
+
+# Digits or a currency sign mark content (amounts, quantities, ids)
+CONTENT_MARKER = re.compile(r"[\d$€£¥]")
+
+
+def _is_boilerplate_candidate(line: str) -> bool:
+    return (
+        len(line) >= MIN_BOILERPLATE_CHARS
+        and any(c.isalpha() for c in line)
+        and not CONTENT_MARKER.search(line)
+    )
+
+
+def drop_repeated_lines(text: str, min_repeats: int = 3) -> str:
+    """
+    Remove running headers/footers from multi-page OCR text.
+
+    Page-number lines are dropped. A line of text with no digits or
+    currency signs that appears at least min_repeats times is kept only
+    on its first occurrence.
+    """
+    lines = text.split("\n")
+    counts = Counter(line for line in lines if _is_boilerplate_candidate(line))
+
+    seen = set()
+    kept = []
+    for line in lines:
+        if PAGE_NUMBER_LINE.match(line):
+            continue
+        if counts.get(line, 0) >= min_repeats:
+            if line in seen:
+                continue
+            seen.add(line)
+        kept.append(line)
+
+    return "\n".join(kept)
+
+
+def clean_text(text: str, drop_repeated: bool = True) -> str:
+    """
+    Whitespace-normalised OCR text, with repeated headers/footers removed
+    unless drop_repeated is False. Meant for prompts; the stored OCR text
+    is left as-is.
+    """
+    text = basic_clean_text(text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return drop_repeated_lines(text) if drop_repeated else text
@@ -0,0 +1,128 @@
+# app/nlp/preprocess.py
+
+"""
+Prompt preprocessing: clean the OCR text, then cut it to a per-operation
+token budget before it is embedded in a Gemini prompt.
+
+Budgets (in estimated tokens, 0 = no limit) come from PROMPT_BUDGET_<OP>:
+
+    classify    512   head of the document; the title and header block
+                      decide the type
+    summarize   8000  head of the document
+    embeddings  2000  head of the document (the embedding model's input
+                      limit is 2048 tokens)
+    extract     0     full text, whitespace-normalised only (repeated
+                      lines are table data here); when limited, head
+                      and tail are kept so totals at the end survive
+
+Tokens are estimated at ~4 characters each; no tokenizer call is made.
+Cache keys still use the raw text, so this does not invalidate the cache.
+"""
+
+import os
+import threading
+from typing import Dict
+
+from app.nlp.clean_text import clean_text
+
+CHARS_PER_TOKEN = 4
+
+DEFAULT_BUDGETS = {
+    "classify": 512,
+    "summarize": 8000,
+    "embeddings": 2000,
+    "extract": 0,
+}
+
+# Operations that keep the end of the document as well as the start
+HEAD_TAIL_OPERATIONS = {"extract"}
+
+# Operations whose prompt keeps every line, repeated or not
+KEEP_REPEATED_OPERATIONS = {"extract"}
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _head(text: str, max_chars: int) -> str:
+    """First max_chars characters, cut back to a line boundary if possible."""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[:cut if cut > max_chars // 2 else max_chars]
+
+
+def _head_tail(text: str, max_chars: int) -> str:
+    """Two thirds of the budget from the start, one third from the end."""
+    if len(text) <= max_chars:
+        return text
+    head = _head(text, max_chars * 2 // 3)
+    tail_chars = max_chars - len(head)
+    start = text.find("\n", len(text) - tail_chars)
+    tail = text[start + 1:] if 0 <= start < len(text) - 1 else text[-tail_chars:]
+    return f"{head}\n...\n{tail}"
+
+
+class PromptPreprocessor:
+
+    def __init__(self):
+        self.budgets = {
+            op: int(os.getenv(f"PROMPT_BUDGET_{op.upper()}", str(default)))
+            for op, default in DEFAULT_BUDGETS.items()
+        }
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, text: str, operation: str) -> str:
+        """Cleaned text for operation's prompt, within its token budget."""
+        if not text:
+            return text
+
+        prepared = clean_text(text, drop_repeated=operation not in KEEP_REPEATED_OPERATIONS)
+
+        budget = self.budgets.get(operation, 0)
+        if budget > 0:
+            max_chars = budget * CHARS_PER_TOKEN
+            if operation in HEAD_TAIL_OPERATIONS:
+                prepared = _head_tail(prepared, max_chars)
+            else:
+                prepared = _head(prepared, max_chars)
+
+        self._record(operation, estimate_tokens(text), estimate_tokens(prepared))
+        return prepared
+
+    def _record(self, operation: str, raw: int, sent: int):
+        with self._lock:
+            c = self.counters.setdefault(operation, {"requests": 0, "raw_tokens": 0, "sent_tokens": 0})
+            c["requests"] += 1
+            c["raw_tokens"] += raw
+            c["sent_tokens"] += sent
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = {op: dict(c) for op, c in self.counters.items()}
+
+        by_operation = {}
+        for op, c in counters.items():
+            saved = c["raw_tokens"] - c["sent_tokens"]
+            by_operation[op] = {
+                **c,
+                "budget": self.budgets.get(op, 0),
+                "tokens_saved": saved,
+                "avg_tokens_saved_per_request": round(saved / c["requests"], 1),
+            }
+
+        raw = sum(c["raw_tokens"] for c in counters.values())
+        sent = sum(c["sent_tokens"] for c in counters.values())
+        return {
+            "raw_tokens": raw,
+            "sent_tokens": sent,
+            "tokens_saved": raw - sent,
+            "saved_pct": round(100 * (raw - sent) / raw, 2) if raw else 0.0,
+            "by_operation": by_operation,
+        }
+
+
+# Singleton instance
+preprocessor = PromptPreprocessor()
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import tempfile
+import zipfile
+from typing import List, Tuple
+
+from app.services.document_service import document_service, FileTooLargeError
+from app.services.pipeline_service import pipeline_service
+
+
+class BatchTooLargeError(ValueError):
+    """A batch holds more documents or uncompressed bytes than allowed."""
+
+
+class BatchService:
+    """
+    Runs many documents through the pipeline concurrently.
+
+    Every part is stored on disk before processing starts, so request
+    memory does not grow with the batch. Limits:
+        BATCH_MAX_FILES       documents per batch, zip members included (50)
+        BATCH_MAX_ZIP_MB      uncompressed PDF bytes per zip archive (200)
+        BATCH_CONCURRENCY     documents in the pipeline at once (4)
+
+    A failure in one document is reported in its own result and never
+    aborts the batch.
+    """
+
+    def __init__(self):
+        self.max_files = int(os.getenv("BATCH_MAX_FILES", "50"))
+        self.max_zip_bytes = int(os.getenv("BATCH_MAX_ZIP_MB", "200")) * 1024 * 1024
+        self.concurrency = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+    def _store_zip_members(self, path: str, budget: int) -> List[Tuple[str, str, bool]]:
+        """
+        Store every PDF inside the zip archive at path as an upload.
+        Members over the upload size limit are skipped.
+
+        Returns:
+            [(filename, file_id, deduplicated), ...]
+
+        Raises:
+            BatchTooLargeError: more than budget PDFs, or more than
+                BATCH_MAX_ZIP_MB of them uncompressed
+        """
+        with zipfile.ZipFile(path) as archive:
+            members = [
+                info for info in archive.infolist()
+                if not info.is_dir()
+                and not info.filename.startswith("__MACOSX/")
+                and info.filename.lower().endswith(".pdf")
+                and info.file_size <= document_service.max_upload_bytes
+            ]
+
+            if len(members) > budget:
+                raise BatchTooLargeError(f"Batch exceeds {self.max_files} documents")
+            if sum(info.file_size for info in members) > self.max_zip_bytes:
+                raise BatchTooLargeError(
+                    f"Zip archive exceeds {self.max_zip_bytes // (1024 * 1024)} MB uncompressed"
+                )
+
+            # One member in memory at a time
+            documents = []
+            for info in members:
+                file_id, deduplicated = document_service.save_file(archive.read(info))
+                documents.append((os.path.basename(info.filename), file_id, deduplicated))
+
+        return documents
+
+    async def expand_zip(self, stream, budget: int) -> List[Tuple[str, str, bool]]:
+        """
+        Spool an uploaded zip to a temporary file (capped at the upload
+        size limit), then store its PDF members. See _store_zip_members.
+        """
+        fd, path = tempfile.mkstemp(suffix=".zip")
+        try:
+            size = 0
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    chunk = await stream.read(document_service.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > document_service.max_upload_bytes:
+                        raise FileTooLargeError(
+                            f"Upload exceeds {document_service.max_upload_bytes // (1024 * 1024)} MB limit"
+                        )
+                    await asyncio.to_thread(f.write, chunk)
+
+            return await asyncio.to_thread(self._store_zip_members, path, budget)
+        finally:
+            os.remove(path)
+
+    async def _process_one(self, filename: str, file_id: str, deduplicated: bool, options: dict, limit: asyncio.Semaphore) -> dict:
+        async with limit:
+            try:
+                stages = pipeline_service.process_stages(file_id, reuse_text=deduplicated, **options)
+                result = await pipeline_service.collect(stages)
+                return {"status": "ok", "filename": filename, "deduplicated": deduplicated, **result}
+            except Exception as e:
+                return {"status": "error", "filename": filename, "error": str(e)}
+
+    async def process(self, documents: List[Tuple[str, str, bool]], **options) -> dict:
+        """Run stored (filename, file_id, deduplicated) documents, BATCH_CONCURRENCY at a time."""
+        limit = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._process_one(name, file_id, dedup, options, limit) for name, file_id, dedup in documents)
+        )
+
+        succeeded = sum(1 for r in results if r["status"] == "ok")
+
+        return {
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": list(results),
+        }
+
+
+# Singleton instance
+batch_service = BatchService()
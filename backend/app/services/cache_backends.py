@@ -0,0 +1,361 @@
+# app/services/cache_backends.py
+
+"""
+Persistent storage engines behind CacheService.
+
+Each backend stores one record per cache key:
+    operation, size (bytes of serialized result), created_at,
+    last_access, text_length and the JSON-encoded result.
+
+Select with CACHE_BACKEND=sqlite (default) or CACHE_BACKEND=json.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class JsonFileBackend:
+    """
+    Legacy store: one indent-2 JSON file per key in a flat directory.
+    clear(operation=...) and stats() have to open every file.
+    """
+
+    name = "json"
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[dict, int]]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get("result"), os.path.getsize(path)
+
+    def set(self, key: str, operation: str, text_length: int, result) -> int:
+        payload = json.dumps({
+            "operation": operation,
+            "cached_at": datetime.now().isoformat(),
+            "text_length": text_length,
+            "result": result
+        }, indent=2)
+
+        with open(self._path(key), 'w', encoding='utf-8') as f:
+            f.write(payload)
+        return len(payload)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[dict, int]]:
+        found = {}
+        for key in keys:
+            hit = self.get(key)
+            if hit is not None:
+                found[key] = hit
+        return found
+
+    def set_many(self, items: List[Tuple[str, str, int, object]]) -> Dict[str, int]:
+        return {key: self.set(key, op, length, result) for key, op, length, result in items}
+
+    def clear(self, operation: Optional[str] = None) -> int:
+        if not os.path.exists(self.cache_dir):
+            return 0
+
+        deleted = 0
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith('.json'):
+                continue
+
+            filepath = os.path.join(self.cache_dir, filename)
+
+            if operation:
+                # Only delete if operation matches
+                try:
+                    with open(filepath, 'r') as f:
+                        data = json.load(f)
+                    if data.get("operation") == operation:
+                        os.remove(filepath)
+                        deleted += 1
+                except (json.JSONDecodeError, IOError):
+                    continue
+            else:
+                os.remove(filepath)
+                deleted += 1
+
+        return deleted
+
+    def stats(self) -> dict:
+        if not os.path.exists(self.cache_dir):
+            return {"total_entries": 0, "total_size_kb": 0.0, "by_operation": {}}
+
+        files = [f for f in os.listdir(self.cache_dir) if f.endswith('.json')]
+
+        ops = {}
+        total_size = 0
+
+        for filename in files:
+            filepath = os.path.join(self.cache_dir, filename)
+            try:
+                total_size += os.path.getsize(filepath)
+                with open(filepath, 'r') as f:
+                    data = json.load(f)
+                op = data.get("operation", "unknown")
+                ops[op] = ops.get(op, 0) + 1
+            except (json.JSONDecodeError, IOError):
+                continue
+
+        return {
+            "total_entries": len(files),
+            "total_size_kb": round(total_size / 1024, 2),
+            "by_operation": ops
+        }
+
+
+class SQLiteBackend:
+    """
+    Indexed embedded store.
+
+    Triggers keep per-operation counts and byte totals in cache_op_stats,
+    so stats() reads a handful of rows however many entries exist.
+    clear(operation=...) is an indexed DELETE.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        key         TEXT PRIMARY KEY,
+        operation   TEXT NOT NULL,
+        size        INTEGER NOT NULL,
+        created_at  TEXT NOT NULL,
+        last_access TEXT NOT NULL,
+        text_length INTEGER NOT NULL DEFAULT 0,
+        result      TEXT NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_cache_entries_operation
+        ON cache_entries(operation);
+
+    CREATE TABLE IF NOT EXISTS cache_op_stats (
+        operation TEXT PRIMARY KEY,
+        entries   INTEGER NOT NULL DEFAULT 0,
+        bytes     INTEGER NOT NULL DEFAULT 0
+    );
+
+    -- WHERE NOT EXISTS, not INSERT OR IGNORE: inside a trigger, the outer
+    -- upsert's conflict handling would override OR IGNORE
+    CREATE TRIGGER IF NOT EXISTS cache_entries_insert
+    AFTER INSERT ON cache_entries BEGIN
+        INSERT INTO cache_op_stats(operation)
+        SELECT NEW.operation
+         WHERE NOT EXISTS (SELECT 1 FROM cache_op_stats WHERE operation = NEW.operation);
+        UPDATE cache_op_stats
+           SET entries = entries + 1, bytes = bytes + NEW.size
+         WHERE operation = NEW.operation;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS cache_entries_delete
+    AFTER DELETE ON cache_entries BEGIN
+        UPDATE cache_op_stats
+           SET entries = entries - 1, bytes = bytes - OLD.size
+         WHERE operation = OLD.operation;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS cache_entries_update
+    AFTER UPDATE OF operation, size ON cache_entries BEGIN
+        UPDATE cache_op_stats
+           SET entries = entries - 1, bytes = bytes - OLD.size
+         WHERE operation = OLD.operation;
+        INSERT INTO cache_op_stats(operation)
+        SELECT NEW.operation
+         WHERE NOT EXISTS (SELECT 1 FROM cache_op_stats WHERE operation = NEW.operation);
+        UPDATE cache_op_stats
+           SET entries = entries + 1, bytes = bytes + NEW.size
+         WHERE operation = NEW.operation;
+    END;
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        # One shared connection; sync routes call in from the threadpool
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+
+    def get(self, key: str) -> Optional[Tuple[dict, int]]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT result, size FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET last_access = ? WHERE key = ?",
+                (datetime.now().isoformat(), key),
+            )
+
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, operation: str, text_length: int, result,
+            created_at: Optional[str] = None) -> int:
+        payload = json.dumps(result)
+        now = datetime.now().isoformat()
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO cache_entries
+                    (key, operation, size, created_at, last_access, text_length, result)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    operation = excluded.operation,
+                    size = excluded.size,
+                    last_access = excluded.last_access,
+                    text_length = excluded.text_length,
+                    result = excluded.result
+                """,
+                (key, operation, len(payload), created_at or now, now, text_length, payload),
+            )
+        return len(payload)
+
+    # SQLite caps bound parameters per statement (999 on older builds)
+    MAX_PARAMS = 900
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[dict, int]]:
+        """Look up many keys with one SELECT per MAX_PARAMS keys."""
+        keys = list(dict.fromkeys(keys))
+        now = datetime.now().isoformat()
+        found = {}
+
+        with self._lock, self._conn:
+            for i in range(0, len(keys), self.MAX_PARAMS):
+                chunk = keys[i:i + self.MAX_PARAMS]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, result, size FROM cache_entries WHERE key IN ({marks})", chunk
+                ).fetchall()
+                self._conn.execute(
+                    f"UPDATE cache_entries SET last_access = ? WHERE key IN ({marks})", (now, *chunk)
+                )
+                for key, result, size in rows:
+                    found[key] = (json.loads(result), size)
+
+        return found
+
+    def set_many(self, items: List[Tuple[str, str, int, object]]) -> Dict[str, int]:
+        """Upsert (key, operation, text_length, result) rows in one transaction."""
+        now = datetime.now().isoformat()
+        rows = []
+        for key, operation, text_length, result in items:
+            payload = json.dumps(result)
+            rows.append((key, operation, len(payload), now, now, text_length, payload))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO cache_entries
+                    (key, operation, size, created_at, last_access, text_length, result)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    operation = excluded.operation,
+                    size = excluded.size,
+                    last_access = excluded.last_access,
+                    text_length = excluded.text_length,
+                    result = excluded.result
+                """,
+                rows,
+            )
+
+        return {row[0]: row[2] for row in rows}
+
+    def clear(self, operation: Optional[str] = None) -> int:
+        with self._lock, self._conn:
+            if operation:
+                cur = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE operation = ?", (operation,)
+                )
+            else:
+                cur = self._conn.execute("DELETE FROM cache_entries")
+            self._conn.execute("DELETE FROM cache_op_stats WHERE entries <= 0")
+            return cur.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT operation, entries, bytes FROM cache_op_stats WHERE entries > 0"
+            ).fetchall()
+
+        return {
+            "total_entries": sum(r[1] for r in rows),
+            "total_size_kb": round(sum(r[2] for r in rows) / 1024, 2),
+            "by_operation": {r[0]: r[1] for r in rows}
+        }
+
+    def import_json_dir(self, cache_dir: str) -> dict:
+        """
+        Import entries written by JsonFileBackend.
+        Keys already present in the database are left untouched.
+        """
+
+        imported = skipped = failed = 0
+
+        for filename in os.listdir(cache_dir):
+            if not filename.endswith('.json'):
+                continue
+
+            key = filename[:-len('.json')]
+            try:
+                with open(os.path.join(cache_dir, filename), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                failed += 1
+                continue
+
+            payload = json.dumps(data.get("result"))
+            created_at = data.get("cached_at") or datetime.now().isoformat()
+
+            with self._lock, self._conn:
+                cur = self._conn.execute(
+                    """
+                    INSERT OR IGNORE INTO cache_entries
+                        (key, operation, size, created_at, last_access, text_length, result)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, data.get("operation", "unknown"), len(payload),
+                     created_at, created_at, data.get("text_length", 0), payload),
+                )
+            if cur.rowcount:
+                imported += 1
+            else:
+                skipped += 1
+
+        return {"imported": imported, "skipped": skipped, "failed": failed}
+
+
+def make_backend():
+    """Build the backend selected by CACHE_BACKEND."""
+    backend = os.getenv("CACHE_BACKEND", "sqlite").lower()
+
+    if backend == "json":
+        return JsonFileBackend(os.getenv("CACHE_DIR", "cache/gemini"))
+    if backend == "sqlite":
+        return SQLiteBackend(os.getenv("CACHE_DB_PATH", "cache/gemini.db"))
+
+    raise RuntimeError(f"Unknown CACHE_BACKEND: {backend}")
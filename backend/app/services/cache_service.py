@@ -1,19 +1,97 @@
 import hashlib
 import json
 import os
-from typing import Optional
-from datetime import datetime
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+from app.services.cache_backends import make_backend
+from app.utils.logger import get_logger, sampled
+from app.utils.metrics import record_cache
+
+logger = get_logger(__name__)
+
+
+class MemoryLRU:
+    """
+    Bounded in-memory LRU tier.
+    Evicts least recently used entries once either the entry count or the
+    approximate payload size (serialized JSON bytes) goes over its limit.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (operation, result, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, operation: str, result, size: int):
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+
+            self._entries[key] = (operation, result, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self, operation: Optional[str] = None):
+        with self._lock:
+            if operation is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+
+            for key in [k for k, v in self._entries.items() if v[0] == operation]:
+                self._bytes -= self._entries.pop(key)[2]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_kb": round(self._bytes / 1024, 2),
+                "max_entries": self.max_entries,
+                "max_size_kb": round(self.max_bytes / 1024, 2),
+            }
 
 
 class CacheService:
     """
     Smart caching layer for Gemini API responses.
     Reduces API calls by 50-90% by caching OCR text and LLM results.
+
+    Two tiers: a bounded in-memory LRU in front of a persistent backend
+    (see cache_backends.py).
     """
 
     def __init__(self):
-        self.cache_dir = "cache/gemini"
-        os.makedirs(self.cache_dir, exist_ok=True)
+        self.backend = make_backend()
+
+        # Hot entries are served from memory without touching the disk
+        self.memory = MemoryLRU(
+            max_entries=int(os.getenv("CACHE_MEMORY_MAX_ENTRIES", "1000")),
+            max_bytes=int(os.getenv("CACHE_MEMORY_MAX_MB", "64")) * 1024 * 1024,
+        )
+        self.counters = {
+            "memory": {"hits": 0, "misses": 0},
+            "disk": {"hits": 0, "misses": 0},
+        }
 
     def _get_cache_key(self, text: str, operation: str) -> str:
         """
@@ -37,19 +115,36 @@ class CacheService:
             Cached result dict or None if not found
         """
         key = self._get_cache_key(text, operation)
-        path = os.path.join(self.cache_dir, f"{key}.json")
-
-        if os.path.exists(path):
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    print(f"✅ CACHE HIT [{operation}] - Saved 1 API call! (key: {key[:8]}...)")
-                    return data.get("result")
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"⚠️ Cache read error: {e}")
-                return None
 
-        print(f"❌ CACHE MISS [{operation}] - Will call Gemini API")
+        # Tier 1: memory
+        result = self.memory.get(key)
+        if result is not None:
+            self.counters["memory"]["hits"] += 1
+            record_cache(operation, hit=True)
+            if sampled():
+                logger.info("cache_hit", extra={"operation": operation, "key": key[:8], "tier": "memory"})
+            return result
+        self.counters["memory"]["misses"] += 1
+
+        # Tier 2: persistent backend
+        try:
+            found = self.backend.get(key)
+        except (json.JSONDecodeError, IOError, sqlite3.Error) as e:
+            logger.warning("cache_read_error", extra={"operation": operation, "error": str(e)})
+            return None
+
+        if found is not None:
+            result, size = found
+            self.counters["disk"]["hits"] += 1
+            record_cache(operation, hit=True)
+            self.memory.put(key, operation, result, size)
+            if sampled():
+                logger.info("cache_hit", extra={"operation": operation, "key": key[:8], "tier": "disk"})
+            return result
+
+        self.counters["disk"]["misses"] += 1
+        record_cache(operation, hit=False)
+        logger.debug("cache_miss", extra={"operation": operation, "key": key[:8]})
         return None
 
     def set(self, text: str, operation: str, result: dict):
@@ -62,83 +157,91 @@ class CacheService:
             result: The API response to cache
         """
         key = self._get_cache_key(text, operation)
-        path = os.path.join(self.cache_dir, f"{key}.json")
 
-        cache_data = {
-            "operation": operation,
-            "cached_at": datetime.now().isoformat(),
-            "text_length": len(text),
-            "result": result
-        }
+        try:
+            size = self.backend.set(key, operation, len(text), result)
+        except (TypeError, ValueError, IOError, sqlite3.Error) as e:
+            logger.warning("cache_write_error", extra={"operation": operation, "error": str(e)})
+            return
+
+        # Write-through: persisted first, then kept hot in memory
+        self.memory.put(key, operation, result, size)
+        if sampled():
+            logger.info("cache_write", extra={"operation": operation, "key": key[:8]})
+
+    def get_many(self, texts: List[str], operation: str) -> List[Optional[dict]]:
+        """
+        Batch get(): one memory pass, then one backend lookup for the rest.
+        Returns results in input order, None for misses.
+        """
+        keys = [self._get_cache_key(text, operation) for text in texts]
+        results = [self.memory.get(key) for key in keys]
+
+        missing = [key for key, result in zip(keys, results) if result is None]
+        self.counters["memory"]["hits"] += len(keys) - len(missing)
+        self.counters["memory"]["misses"] += len(missing)
+
+        found = {}
+        if missing:
+            try:
+                found = self.backend.get_many(missing)
+            except (json.JSONDecodeError, IOError, sqlite3.Error) as e:
+                logger.warning("cache_read_error", extra={"operation": operation, "error": str(e)})
+
+        for i, key in enumerate(keys):
+            if results[i] is None and key in found:
+                result, size = found[key]
+                self.memory.put(key, operation, result, size)
+                results[i] = result
+
+        disk_hits = sum(1 for key in set(missing) if key in found)
+        self.counters["disk"]["hits"] += disk_hits
+        self.counters["disk"]["misses"] += len(set(missing)) - disk_hits
+
+        hits = sum(1 for r in results if r is not None)
+        record_cache(operation, hit=True, count=hits)
+        record_cache(operation, hit=False, count=len(keys) - hits)
+        logger.debug("cache_batch", extra={"operation": operation, "hits": hits, "total": len(keys)})
+        return results
+
+    def set_many(self, texts: List[str], operation: str, results: List[dict]):
+        """Batch set(): all entries written to the backend in one go."""
+        keys = [self._get_cache_key(text, operation) for text in texts]
+        items = [
+            (key, operation, len(text), result)
+            for key, text, result in zip(keys, texts, results)
+        ]
 
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2)
-            print(f"💾 CACHED [{operation}] (key: {key[:8]}...)")
-        except IOError as e:
-            print(f"⚠️ Cache write error: {e}")
+            sizes = self.backend.set_many(items)
+        except (TypeError, ValueError, IOError, sqlite3.Error) as e:
+            logger.warning("cache_write_error", extra={"operation": operation, "error": str(e)})
+            return
+
+        for key, _, _, result in items:
+            self.memory.put(key, operation, result, sizes[key])
+        logger.debug("cache_write_batch", extra={"operation": operation, "entries": len(items)})
 
     def clear(self, operation: Optional[str] = None):
         """
-        Clear cache files.
+        Clear cache entries.
 
         Args:
             operation: If specified, only clear caches for this operation type
         """
-        if not os.path.exists(self.cache_dir):
-            return
+        self.memory.clear(operation)
+        deleted = self.backend.clear(operation)
 
-        deleted = 0
-        for filename in os.listdir(self.cache_dir):
-            if not filename.endswith('.json'):
-                continue
-
-            filepath = os.path.join(self.cache_dir, filename)
-
-            if operation:
-                # Only delete if operation matches
-                try:
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-                        if data.get("operation") == operation:
-                            os.remove(filepath)
-                            deleted += 1
-                except:
-                    continue
-            else:
-                # Delete all
-                os.remove(filepath)
-                deleted += 1
-
-        print(f"🗑️ Cleared {deleted} cache entries")
+        logger.info("cache_cleared", extra={"operation": operation, "deleted": deleted})
 
     def stats(self) -> dict:
         """Get cache statistics."""
-        if not os.path.exists(self.cache_dir):
-            return {"total_entries": 0}
-
-        files = [f for f in os.listdir(self.cache_dir) if f.endswith('.json')]
-
-        ops = {}
-        total_size = 0
-
-        for filename in files:
-            filepath = os.path.join(self.cache_dir, filename)
-            try:
-                total_size += os.path.getsize(filepath)
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                    op = data.get("operation", "unknown")
-                    ops[op] = ops.get(op, 0) + 1
-            except:
-                continue
-
-        return {
-            "total_entries": len(files),
-            "total_size_kb": round(total_size / 1024, 2),
-            "by_operation": ops
-        }
+        stats = self.backend.stats()
+        stats["backend"] = self.backend.name
+        stats["memory"] = self.memory.stats()
+        stats["tiers"] = self.counters
+        return stats
 
 
 # Singleton instance
-cache_service = CacheService()
\ No newline at end of file
+cache_service = CacheService()
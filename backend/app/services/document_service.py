@@ -1,28 +1,153 @@
+import asyncio
+import hashlib
+import json
 import os
 import uuid
-from typing import Optional
+from typing import Optional, Tuple
+
+
+class FileTooLargeError(ValueError):
+    pass
+
 
 class DocumentService:
+    CHUNK_SIZE = 1024 * 1024
+
     def __init__(self):
         self.upload_dir = "uploads"
         self.cache_dir = "cache"
+        self.max_upload_bytes = int(os.getenv("UPLOAD_MAX_MB", "50")) * 1024 * 1024
+        # content hash -> file_id markers, one small file per hash
+        self.hash_dir = os.path.join(self.upload_dir, "by_hash")
 
         os.makedirs(self.upload_dir, exist_ok=True)
         os.makedirs(self.cache_dir, exist_ok=True)
+        os.makedirs(self.hash_dir, exist_ok=True)
+
+    # ------------------------------------------
+    # CONTENT HASHING
+    # ------------------------------------------
+    @staticmethod
+    def content_hash(file_bytes: bytes) -> str:
+        return hashlib.sha256(file_bytes).hexdigest()
+
+    def find_by_hash(self, content_hash: str) -> Optional[str]:
+        """Return the file_id already stored for this content, if any."""
+        marker = os.path.join(self.hash_dir, content_hash)
+
+        if not os.path.exists(marker):
+            return None
+
+        with open(marker, "r", encoding="utf-8") as f:
+            file_id = f.read().strip()
+
+        # Ignore markers whose blob has been removed
+        if not os.path.exists(os.path.join(self.upload_dir, f"{file_id}.pdf")):
+            return None
+
+        return file_id
+
+    def _register_hash(self, content_hash: str, file_id: str):
+        marker = os.path.join(self.hash_dir, content_hash)
+        tmp = f"{marker}.{file_id}.tmp"
+
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(file_id)
+        os.replace(tmp, marker)
 
     # ------------------------------------------
     # SAVE FILE
     # ------------------------------------------
-    def save_file(self, file) -> str:
-        file_id = str(uuid.uuid4())
-        filename = f"{file_id}.pdf"
+    def save_file(self, file) -> Tuple[str, bool]:
+        """
+        Store an upload, deduplicated by SHA-256 of its content.
+
+        Returns:
+            (file_id, deduplicated) — deduplicated is True when identical
+            content was already stored and its file_id is reused.
+        """
+        content_hash = self.content_hash(file)
 
-        path = os.path.join(self.upload_dir, filename)
+        existing = self.find_by_hash(content_hash)
+        if existing:
+            return existing, True
 
-        with open(path, "wb") as f:
+        file_id = str(uuid.uuid4())
+        tmp_path = self._part_path(file_id)
+
+        with open(tmp_path, "wb") as f:
             f.write(file)
 
-        return file_id
+        self._commit_file(tmp_path, file_id, content_hash)
+
+        return file_id, False
+
+    # ------------------------------------------
+    # SAVE FILE (STREAMED)
+    # ------------------------------------------
+    async def save_stream(self, stream) -> Tuple[str, bool, int]:
+        """
+        Stream an upload to disk in CHUNK_SIZE pieces.
+
+        SHA-256 and size are computed as chunks arrive, so memory stays
+        constant regardless of file size. Writes run in a worker thread,
+        off the event loop. The file is written to a
+        temporary .part file and moved into place atomically.
+
+        Args:
+            stream: Any object with an async read(n) (e.g. UploadFile)
+
+        Returns:
+            (file_id, deduplicated, size_bytes)
+
+        Raises:
+            FileTooLargeError: once more than max_upload_bytes are read
+        """
+        file_id = str(uuid.uuid4())
+        tmp_path = self._part_path(file_id)
+        hasher = hashlib.sha256()
+        size = 0
+
+        try:
+            with open(tmp_path, "wb") as f:
+                while True:
+                    chunk = await stream.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+
+                    size += len(chunk)
+                    if size > self.max_upload_bytes:
+                        raise FileTooLargeError(
+                            f"Upload exceeds {self.max_upload_bytes // (1024 * 1024)} MB limit"
+                        )
+
+                    hasher.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+
+            content_hash = hasher.hexdigest()
+
+            existing = self.find_by_hash(content_hash)
+            if existing:
+                os.remove(tmp_path)
+                return existing, True, size
+
+            self._commit_file(tmp_path, file_id, content_hash)
+            return file_id, False, size
+
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _part_path(self, file_id: str) -> str:
+        return os.path.join(self.upload_dir, f".{file_id}.part")
+
+    def _commit_file(self, tmp_path: str, file_id: str, content_hash: str):
+        os.replace(tmp_path, os.path.join(self.upload_dir, f"{file_id}.pdf"))
+        self._register_hash(content_hash, file_id)
+
+    def has_file(self, file_id: str) -> bool:
+        return os.path.exists(os.path.join(self.upload_dir, f"{file_id}.pdf"))
 
     # ------------------------------------------
     # READ RAW BYTES FOR OCR
@@ -57,6 +182,24 @@ class DocumentService:
         with open(path, "r", encoding="utf-8") as f:
             return f.read()
 
+    # ------------------------------------------
+    # SAVE / GET DOCUMENT AI LAYOUT (next to the text)
+    # ------------------------------------------
+    def save_layout(self, file_id: str, layout: dict):
+        path = os.path.join(self.cache_dir, f"{file_id}.layout.json")
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(layout, f, separators=(",", ":"), ensure_ascii=False)
+
+    def get_layout(self, file_id: str) -> Optional[dict]:
+        path = os.path.join(self.cache_dir, f"{file_id}.layout.json")
+
+        if not os.path.exists(path):
+            return None
+
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
 
 # Singleton instance
 document_service = DocumentService()
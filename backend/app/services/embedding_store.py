@@ -0,0 +1,227 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, single writer only
+    fcntl = None
+
+
+class EmbeddingStore:
+    """
+    Document embeddings as one contiguous float32 matrix on disk.
+
+    Layout (EMBEDDING_STORE_DIR, default cache/embeddings):
+        vectors.f32   row-major float32, one L2-normalised row per document
+        ids.tsv       "<doc_id>\\t<doc_type>" per row, same order
+        meta.json     {"dim": 768}
+
+    The matrix is memory-mapped, so opening the store costs only reading
+    ids.tsv, and search is one matrix-vector product over the mapped
+    rows (cosine similarity, since rows are unit length). Adding a known
+    doc_id overwrites its row in place; new ids are appended.
+
+    Several worker processes can share one store: every operation holds
+    an exclusive flock on store.lock and first reloads ids.tsv if another
+    process changed it, so appends never interleave. (Without fcntl, e.g.
+    on Windows, only one process may write.)
+    """
+
+    def __init__(self, store_dir: Optional[str] = None):
+        self.store_dir = store_dir or os.getenv("EMBEDDING_STORE_DIR", "cache/embeddings")
+        os.makedirs(self.store_dir, exist_ok=True)
+
+        self.vectors_path = os.path.join(self.store_dir, "vectors.f32")
+        self.ids_path = os.path.join(self.store_dir, "ids.tsv")
+        self.meta_path = os.path.join(self.store_dir, "meta.json")
+
+        self._lock = threading.Lock()
+        self._lock_file = open(os.path.join(self.store_dir, "store.lock"), "a")
+        self._ids_stamp = None  # (size, mtime_ns) of ids.tsv as last loaded
+
+        with self._locked():
+            self._load()
+
+            # A crash between the two appends can leave one side a row longer
+            rows = self._rows_on_disk()
+            if rows > len(self.ids):
+                os.truncate(self.vectors_path, len(self.ids) * 4 * self.dim)
+            elif rows < len(self.ids):
+                self.ids, self.types = self.ids[:rows], self.types[:rows]
+                self.row_of = {doc_id: i for i, doc_id in enumerate(self.ids)}
+                self._rewrite_ids()
+
+    @contextmanager
+    def _locked(self):
+        """Thread lock plus an exclusive flock shared with other processes."""
+        with self._lock:
+            if fcntl:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _stat_ids(self):
+        try:
+            st = os.stat(self.ids_path)
+        except FileNotFoundError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _load(self):
+        """(Re)read meta.json and ids.tsv. Call with the lock held."""
+        self._matrix = None  # memmap over vectors.f32, reopened after appends
+        self._type_codes = None  # numpy copy of self.types for filtering
+
+        self.dim = None
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.dim = json.load(f)["dim"]
+
+        self._ids_stamp = self._stat_ids()
+        self.ids: List[str] = []
+        self.types: List[str] = []
+        if self._ids_stamp is not None:
+            with open(self.ids_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    doc_id, _, doc_type = line.rstrip("\n").partition("\t")
+                    self.ids.append(doc_id)
+                    self.types.append(doc_type)
+
+        self.row_of = {doc_id: i for i, doc_id in enumerate(self.ids)}
+
+    def _sync(self):
+        """Reload if another process changed ids.tsv. Call with the lock held."""
+        if self._stat_ids() != self._ids_stamp:
+            self._load()
+
+    def _rows_on_disk(self) -> int:
+        if not self.dim or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (4 * self.dim)
+
+    def _matrix_view(self) -> np.ndarray:
+        n = len(self.ids)
+        if n == 0:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        if self._matrix is None or self._matrix.shape[0] < n:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(n, self.dim))
+        return self._matrix[:n]
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        v = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(v)
+        return v / norm if norm > 0 else v
+
+    def add(self, doc_id: str, vector, doc_type: Optional[str] = None):
+        """Store doc_id's vector; doc_type None keeps the known type."""
+        v = self._normalize(vector)
+        if v.size == 0:
+            return
+
+        with self._locked():
+            self._sync()
+            if self.dim is None:
+                self.dim = int(v.size)
+                with open(self.meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"dim": self.dim}, f)
+            elif v.size != self.dim:
+                raise ValueError(f"Embedding has {v.size} dimensions, store uses {self.dim}")
+
+            row = self.row_of.get(doc_id)
+            if row is not None:
+                self._matrix_view()[row] = v
+                self._matrix.flush()
+                if doc_type is not None and self.types[row] != doc_type:
+                    self.types[row] = doc_type
+                    self._rewrite_ids()
+                return
+
+            doc_type = doc_type or "unknown"
+            with open(self.vectors_path, "ab") as f:
+                f.write(v.tobytes())
+            with open(self.ids_path, "a", encoding="utf-8") as f:
+                f.write(f"{doc_id}\t{doc_type}\n")
+
+            self.row_of[doc_id] = len(self.ids)
+            self.ids.append(doc_id)
+            self.types.append(doc_type)
+            self._type_codes = None
+            self._ids_stamp = self._stat_ids()
+
+    def _rewrite_ids(self):
+        tmp = self.ids_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(f"{i}\t{t}\n" for i, t in zip(self.ids, self.types))
+        os.replace(tmp, self.ids_path)
+        self._type_codes = None
+        self._ids_stamp = self._stat_ids()
+
+    def get(self, doc_id: str) -> Optional[np.ndarray]:
+        with self._locked():
+            self._sync()
+            row = self.row_of.get(doc_id)
+            if row is None:
+                return None
+            return np.array(self._matrix_view()[row])
+
+    def get_type(self, doc_id: str) -> Optional[str]:
+        with self._locked():
+            self._sync()
+            row = self.row_of.get(doc_id)
+            return None if row is None else self.types[row]
+
+    def search(self, vector, k: int = 10, doc_type: Optional[str] = None, exclude: Optional[str] = None) -> List[dict]:
+        """
+        Top-k stored documents by cosine similarity to vector.
+
+        Returns:
+            [{"doc_id", "doc_type", "score"}, ...], best first.
+        """
+        q = self._normalize(vector)
+
+        with self._locked():
+            self._sync()
+            matrix = self._matrix_view()
+            if matrix.shape[0] == 0 or q.size != self.dim:
+                return []
+
+            scores = matrix @ q
+
+            if doc_type is not None:
+                if self._type_codes is None:
+                    self._type_codes = np.array(self.types)
+                scores = np.where(self._type_codes == doc_type, scores, -np.inf)
+
+            ids, types = self.ids, self.types
+            if exclude in self.row_of:
+                scores[self.row_of[exclude]] = -np.inf
+
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {"doc_id": ids[i], "doc_type": types[i], "score": round(float(scores[i]), 4)}
+            for i in top
+            if np.isfinite(scores[i])
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self.ids),
+            "dim": self.dim,
+            "size_mb": round(len(self.ids) * (self.dim or 0) * 4 / (1024 * 1024), 2),
+        }
+
+
+# Singleton instance
+embedding_store = EmbeddingStore()
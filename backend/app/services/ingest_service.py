@@ -0,0 +1,118 @@
+import asyncio
+import os
+from typing import List, Tuple
+
+from app.services.ocr_service import ocr_service
+from app.utils.metrics import track_stage
+from app.utils.pdf_utils import page_texts, select_pages
+
+
+class IngestService:
+    """
+    Text for an uploaded PDF, using its embedded text layer where it can.
+
+    Digital PDFs (exported by accounting systems etc.) already carry their
+    text; reading it locally takes milliseconds instead of a Document AI
+    round trip. A page's text layer is used when it has at least
+    TEXT_LAYER_MIN_CHARS non-space characters (default 50) and at least
+    TEXT_LAYER_MIN_PRINTABLE of them are printable (default 0.95).
+    Other pages (scanned, image-only, garbled fonts) are OCR'd, each
+    contiguous run as its own small PDF. All runs of a document share
+    one OCR_PAGE_CONCURRENCY cap.
+
+    The returned layout records which pages came from where in
+    "ocr_pages" / "text_layer_pages". Tables and form fields only exist
+    for OCR'd pages. TEXT_LAYER_ENABLED=false sends every file to OCR.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("TEXT_LAYER_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.min_chars = int(os.getenv("TEXT_LAYER_MIN_CHARS", "50"))
+        self.min_printable = float(os.getenv("TEXT_LAYER_MIN_PRINTABLE", "0.95"))
+
+    def usable(self, text: str) -> bool:
+        """True if a page's embedded text looks complete enough to skip OCR."""
+        chars = [ch for ch in text if not ch.isspace()]
+        if len(chars) < self.min_chars:
+            return False
+
+        printable = sum(1 for ch in chars if ch.isprintable() and ch != "�")
+        return printable / len(chars) >= self.min_printable
+
+    async def extract_async(self, file_bytes: bytes) -> Tuple[str, dict]:
+        """
+        Returns:
+            (text, layout) like ocr_service.extract_document_async, with
+            layout["ocr_pages"] and layout["text_layer_pages"] added.
+        """
+        with track_stage("ocr"):
+            return await self._extract(file_bytes)
+
+    async def _extract(self, file_bytes: bytes) -> Tuple[str, dict]:
+        texts = await asyncio.to_thread(self._local_texts, file_bytes)
+
+        # Not a readable PDF, or no usable page at all: plain OCR
+        if not texts or not any(self.usable(t) for t in texts):
+            text, layout = await ocr_service.extract_document_async(file_bytes)
+            pages = list(range(1, layout.get("pages", 0) + 1))
+            return text, {**layout, "ocr_pages": pages, "text_layer_pages": []}
+
+        scanned = [i for i, t in enumerate(texts, start=1) if not self.usable(t)]
+        runs = _runs(scanned)
+
+        # Each run of scanned pages is OCR'd as its own small PDF
+        limit = ocr_service.new_page_limit()
+        ocr_results = await asyncio.gather(*(
+            self._ocr_pages(file_bytes, run, limit) for run in runs
+        ))
+        by_first_page = {run[0]: (run, result) for run, result in zip(runs, ocr_results)}
+
+        parts = []
+        layout = {"pages": len(texts), "tables": [], "fields": [], "entities": []}
+        page = 1
+        while page <= len(texts):
+            if page in by_first_page:
+                run, (run_text, run_layout) = by_first_page[page]
+                parts.append(run_text)
+                for key in ("tables", "fields"):
+                    for item in run_layout[key]:
+                        item["page"] += page - 1
+                        layout[key].append(item)
+                layout["entities"].extend(run_layout["entities"])
+                page += len(run)
+            else:
+                parts.append(texts[page - 1])
+                page += 1
+
+        layout["ocr_pages"] = scanned
+        layout["text_layer_pages"] = [i for i, t in enumerate(texts, start=1) if self.usable(t)]
+
+        text = "\n".join(p.rstrip("\n") for p in parts)
+        return text, layout
+
+    def _local_texts(self, file_bytes: bytes) -> List[str]:
+        if not self.enabled:
+            return []
+        try:
+            return page_texts(file_bytes)
+        except Exception:
+            return []
+
+    async def _ocr_pages(self, file_bytes: bytes, pages: List[int], limit: asyncio.Semaphore) -> Tuple[str, dict]:
+        subset = await asyncio.to_thread(select_pages, file_bytes, pages)
+        return await ocr_service.extract_document_async(subset, limit=limit)
+
+
+def _runs(pages: List[int]) -> List[List[int]]:
+    """Group sorted page numbers into runs of consecutive pages."""
+    runs = []
+    for p in pages:
+        if runs and runs[-1][-1] == p - 1:
+            runs[-1].append(p)
+        else:
+            runs.append([p])
+    return runs
+
+
+# Singleton instance
+ingest_service = IngestService()
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.services.pipeline_service import pipeline_service
+from app.utils.logger import get_logger, request_id_var
+
+logger = get_logger(__name__)
+
+# Stages a job goes through, in order (upload happens before submission)
+JOB_STAGES = ["ocr", "detect", "extract"]
+
+
+class JobStore:
+    """
+    SQLite-backed job records, so queued and running jobs survive a restart.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id         TEXT PRIMARY KEY,
+        file_id    TEXT NOT NULL,
+        status     TEXT NOT NULL,
+        stage      TEXT,
+        progress   REAL NOT NULL DEFAULT 0,
+        options    TEXT NOT NULL,
+        timings    TEXT NOT NULL DEFAULT '{}',
+        result     TEXT,
+        error      TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+    """
+
+    JSON_FIELDS = ("options", "timings", "result")
+
+    def __init__(self, db_path: str):
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+
+    def create(self, job_id: str, file_id: str, options: dict):
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO jobs (id, file_id, status, options, created_at, updated_at)
+                VALUES (?, ?, 'queued', ?, ?, ?)
+                """,
+                (job_id, file_id, json.dumps(options), now, now),
+            )
+
+    def update(self, job_id: str, **fields):
+        for name in self.JSON_FIELDS:
+            if name in fields:
+                fields[name] = json.dumps(fields[name])
+        fields["updated_at"] = datetime.now().isoformat()
+
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE jobs SET {columns} WHERE id = ?",
+                (*fields.values(), job_id),
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        for name in self.JSON_FIELDS:
+            if job[name] is not None:
+                job[name] = json.loads(job[name])
+        return job
+
+    def claim(self, job_id: str) -> bool:
+        """
+        Atomically move a queued job to running. False if another worker
+        (in this or another process) already claimed it.
+        """
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                """
+                UPDATE jobs SET status = 'running', stage = NULL, progress = 0, updated_at = ?
+                WHERE id = ? AND status = 'queued'
+                """,
+                (now, job_id),
+            )
+        return cursor.rowcount == 1
+
+    def release(self, job_ids):
+        """Back to queued: running jobs this process gives up (shutdown)."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE jobs SET status = 'queued' WHERE id = ? AND status = 'running'",
+                [(job_id,) for job_id in job_ids],
+            )
+
+    def touch(self, job_ids):
+        """Heartbeat: bump updated_at so running jobs are not seen as stale."""
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE jobs SET updated_at = ? WHERE id = ? AND status = 'running'",
+                [(now, job_id) for job_id in job_ids],
+            )
+
+    def requeue_stale(self, older_than: datetime) -> int:
+        """Back to queued: running jobs not updated since older_than (their worker died)."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'queued' WHERE status = 'running' AND updated_at < ?",
+                (older_than.isoformat(),),
+            )
+        return cursor.rowcount
+
+    def queued(self) -> list:
+        """Ids of queued jobs, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at"
+            ).fetchall()
+        return [r["id"] for r in rows]
+
+
+class JobService:
+    """
+    In-process background workers for OCR -> classify -> extract.
+
+    Submitting only records the job and enqueues it, so HTTP handlers
+    return immediately. JOB_WORKERS asyncio workers drain the queue; the
+    pipeline's own semaphores still cap outbound OCR / LLM concurrency.
+
+    The store, not the in-process queue, is the source of truth. Every
+    JOB_POLL_SECONDS (default 10) a maintenance task:
+      - heartbeats the jobs this process is running,
+      - requeues running jobs with no heartbeat for JOB_STALE_MINUTES
+        (default 2), whose worker is presumed dead,
+      - enqueues stored queued jobs when the local queue is idle, so jobs
+        submitted to another process or requeued are picked up.
+    A worker claims a job atomically before running it, so with several
+    uvicorn processes each job still runs once. On shutdown the jobs this
+    process was running go back to queued.
+    """
+
+    def __init__(self):
+        self.store = JobStore(os.getenv("JOBS_DB_PATH", "cache/jobs.db"))
+        self.num_workers = int(os.getenv("JOB_WORKERS", "4"))
+        self.poll_interval = float(os.getenv("JOB_POLL_SECONDS", "10"))
+        self.stale_after = timedelta(minutes=float(os.getenv("JOB_STALE_MINUTES", "2")))
+        self.queue: Optional[asyncio.Queue] = None
+        self._workers = []
+        self._running = set()  # job ids claimed by this process
+
+    async def start(self):
+        self.queue = asyncio.Queue()
+
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.num_workers)
+        ]
+        self._workers.append(asyncio.create_task(self._maintain()))
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        # Workers release their job on cancellation; this covers any left
+        if self._running:
+            self.store.release(self._running)
+            self._running.clear()
+
+    def submit(self, file_id: str, **options) -> dict:
+        if self.queue is None:
+            raise RuntimeError("Job workers are not running")
+
+        job_id = str(uuid.uuid4())
+        self.store.create(job_id, file_id, options)
+        self.queue.put_nowait(job_id)
+
+        return self.store.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    async def _maintain(self):
+        while True:
+            try:
+                if self._running:
+                    self.store.touch(self._running)
+                requeued = self.store.requeue_stale(datetime.now() - self.stale_after)
+                if requeued:
+                    logger.warning("jobs_requeued", extra={"count": requeued})
+                if self.queue.empty():
+                    for job_id in self.store.queued():
+                        self.queue.put_nowait(job_id)
+            except Exception:
+                logger.exception("job_maintenance_failed")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _worker(self):
+        while True:
+            job_id = await self.queue.get()
+            # Workers outlive requests, so log lines carry the job id instead
+            token = request_id_var.set(job_id)
+            try:
+                await self._run(job_id)
+            finally:
+                request_id_var.reset(token)
+                self.queue.task_done()
+
+    async def _run(self, job_id: str):
+        if not self.store.claim(job_id):
+            return
+        self._running.add(job_id)
+        job = self.store.get(job_id)
+
+        def on_stage(stage: str, timings: dict):
+            done = JOB_STAGES.index(stage) + 1 if stage in JOB_STAGES else 0
+            self.store.update(
+                job_id,
+                stage=stage,
+                progress=round(done / len(JOB_STAGES), 2),
+                timings=timings,
+            )
+
+        try:
+            # No bytes passed: the OCR stage reads the file in a thread, and
+            # only if the stored text cannot be reused
+            stages = pipeline_service.process_stages(
+                job["file_id"], reuse_text=True, **job["options"]
+            )
+            result = await pipeline_service.collect(stages, on_stage=on_stage)
+            self.store.update(job_id, status="done", progress=1.0, result=result)
+
+        except asyncio.CancelledError:
+            self.store.release([job_id])
+            raise
+
+        except Exception as e:
+            logger.exception("job_failed", extra={"file_id": job["file_id"]})
+            self.store.update(job_id, status="failed", error=str(e))
+
+        finally:
+            self._running.discard(job_id)
+
+
+# Singleton instance
+job_service = JobService()
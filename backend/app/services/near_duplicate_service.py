@@ -0,0 +1,169 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from typing import Optional
+
+import numpy as np
+
+from app.nlp.clean_text import clean_text
+
+_WORD = re.compile(r"\w+")
+
+# Prime just above 2**32: with 32-bit shingle hashes and coefficients,
+# a * x + b stays below 2**64, so uint64 arithmetic never overflows
+_PRIME = np.uint64(4294967311)
+
+# Shingles hashed per step: keeps the (permutations x block) uint64
+# matrix at a few MB however long the document is
+_BLOCK = 4096
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH index over OCR text, for spotting re-scans.
+
+    Each document becomes a set of word 3-gram shingles, summarised by a
+    NEAR_DUP_PERMUTATIONS-value MinHash signature (default 128). The
+    signature is cut into NEAR_DUP_BANDS bands (default 16); documents
+    sharing any band bucket are candidates, and candidates are scored by
+    the share of equal signature values (estimated Jaccard similarity).
+    A lookup reads a handful of indexed bucket rows plus the candidates'
+    signatures, so its cost does not grow with the corpus.
+
+    Matches at or above NEAR_DUP_THRESHOLD (default 0.95) are reported.
+    Callers reuse a match's results only when asked to (NEAR_DUP_REUSE,
+    default false): a near-identical invoice may still differ in one
+    amount. Signatures and buckets live in SQLite (NEAR_DUP_DB_PATH).
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS signatures (
+        doc_id    TEXT PRIMARY KEY,
+        signature BLOB NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS buckets (
+        band    INTEGER NOT NULL,
+        bucket  INTEGER NOT NULL,
+        doc_id  TEXT NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_buckets ON buckets(band, bucket);
+    CREATE INDEX IF NOT EXISTS idx_buckets_doc ON buckets(doc_id);
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        db_path = db_path or os.getenv("NEAR_DUP_DB_PATH", "cache/near_dup.db")
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self.num_perm = int(os.getenv("NEAR_DUP_PERMUTATIONS", "128"))
+        self.bands = int(os.getenv("NEAR_DUP_BANDS", "16"))
+        self.threshold = float(os.getenv("NEAR_DUP_THRESHOLD", "0.95"))
+        self.reuse = os.getenv("NEAR_DUP_REUSE", "false").lower() in ("1", "true", "yes")
+        if self.num_perm % self.bands:
+            raise RuntimeError("NEAR_DUP_PERMUTATIONS must be a multiple of NEAR_DUP_BANDS")
+        self.rows = self.num_perm // self.bands
+
+        # Fixed seed: signatures must stay comparable across restarts
+        rng = np.random.default_rng(1)
+        self._a = rng.integers(1, 2**32, self.num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2**32, self.num_perm, dtype=np.uint64)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of text's word 3-grams, or None if too short."""
+        words = _WORD.findall(clean_text(text).lower())
+        if len(words) < 3:
+            return None
+
+        shingles = {" ".join(words[i:i + 3]) for i in range(len(words) - 2)}
+        x = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+        sig = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, x.size, _BLOCK):
+            block = x[None, start:start + _BLOCK]
+            hashed = (self._a[:, None] * block + self._b[:, None]) % _PRIME
+            np.minimum(sig, hashed.min(axis=1), out=sig)
+        return sig
+
+    def _band_keys(self, sig: np.ndarray):
+        for band in range(self.bands):
+            chunk = sig[band * self.rows:(band + 1) * self.rows].tobytes()
+            yield band, int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "big", signed=True)
+
+    def _best_match(self, sig: np.ndarray, exclude: Optional[str]) -> Optional[dict]:
+        keys = list(self._band_keys(sig))
+        where = " OR ".join(["(band = ? AND bucket = ?)"] * len(keys))
+        params = [v for key in keys for v in key]
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT s.doc_id, s.signature FROM signatures s
+                WHERE s.doc_id IN (SELECT DISTINCT doc_id FROM buckets WHERE {where})
+                """,
+                params,
+            ).fetchall()
+
+        best = None
+        for doc_id, blob in rows:
+            if doc_id == exclude:
+                continue
+            score = float(np.mean(np.frombuffer(blob, dtype=np.uint64) == sig))
+            if best is None or score > best["score"]:
+                best = {"file_id": doc_id, "score": round(score, 4)}
+
+        if best and best["score"] >= self.threshold:
+            return best
+        return None
+
+    def find(self, text: str, exclude: Optional[str] = None) -> Optional[dict]:
+        """
+        Closest indexed document at or above the threshold.
+
+        Returns:
+            {"file_id", "score"} or None.
+        """
+        sig = self.signature(text)
+        if sig is None:
+            return None
+        return self._best_match(sig, exclude)
+
+    def add(self, doc_id: str, text: str) -> Optional[dict]:
+        """
+        Index doc_id's text. Returns its best prior match (as find()),
+        looked up before doc_id itself is added.
+        """
+        sig = self.signature(text)
+        if sig is None:
+            return None
+
+        match = self._best_match(sig, exclude=doc_id)
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM buckets WHERE doc_id = ?", (doc_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO signatures (doc_id, signature) VALUES (?, ?)",
+                (doc_id, sig.tobytes()),
+            )
+            self._conn.executemany(
+                "INSERT INTO buckets (band, bucket, doc_id) VALUES (?, ?, ?)",
+                [(band, bucket, doc_id) for band, bucket in self._band_keys(sig)],
+            )
+
+        return match
+
+
+# Singleton instance
+near_duplicate_index = NearDuplicateIndex()
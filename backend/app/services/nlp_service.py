@@ -1,14 +1,28 @@
 from app.llm.gemini_client import GeminiClient
+from app.utils.metrics import track_stage
 
 class NLPService:
     def __init__(self):
         self.gemini = GeminiClient()
 
     def summarize(self, text: str) -> str:
-        return self.gemini.summarize(text)
+        with track_stage("summarize"):
+            return self.gemini.summarize(text)
 
-    def embed_text(self, text: str):
-        return self.gemini.generate_embeddings(text)
+    async def summarize_async(self, text: str) -> str:
+        with track_stage("summarize"):
+            return await self.gemini.summarize_async(text)
+
+    async def embed_text_async(self, text: str):
+        # Same pooled-chunk vector as embed_document_async, so every vector
+        # in the embedding store means the same thing
+        with track_stage("embed"):
+            return (await self.gemini.generate_document_embeddings_async(text))["vector"]
+
+    async def embed_document_async(self, text: str) -> dict:
+        """Pooled vector plus per-chunk vectors, for any document length."""
+        with track_stage("embed"):
+            return await self.gemini.generate_document_embeddings_async(text)
 
 
 # ✅ Add this line so extract_router can import it
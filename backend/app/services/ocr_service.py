@@ -1,58 +1,244 @@
+import asyncio
 import os
+from typing import Callable, List, Optional, Tuple
 from dotenv import load_dotenv
 from google.cloud import documentai_v1 as documentai
 
+from app.utils.logger import get_logger
+from app.utils.metrics import record_bytes
+from app.utils.pdf_utils import page_count, split_pages
+
 load_dotenv()
 
+logger = get_logger(__name__)
+
 class OCRService:
-    def __init__(self):
+    """
+    Document AI OCR.
+
+    PDFs longer than OCR_PAGES_PER_REQUEST pages (default 10) are split
+    into page ranges that are OCR'd in parallel, at most
+    OCR_PAGE_CONCURRENCY (default 4) requests at a time per document.
+    Failed ranges are retried up to OCR_PAGE_RETRIES times (default 2)
+    before the whole call fails. Text and layout are merged back in page
+    order.
+
+    async_client can be any object with an async
+    process_document(request=...) method, e.g. a local fake in tests.
+    """
+
+    def __init__(self, async_client=None):
         # Load environment variables
         self.project_id = os.getenv("GCP_PROJECT_ID")
         self.location = os.getenv("GCP_LOCATION")
         self.processor_id = os.getenv("GCP_PROCESSOR_ID")
 
-        print(f"[OCR DEBUG] PROJECT = {self.project_id}")
-        print(f"[OCR DEBUG] LOCATION = {self.location}")
-        print(f"[OCR DEBUG] PROCESSOR = {self.processor_id}")
+        # Optional override so load tests can point at a local stand-in server
+        endpoint = os.getenv("DOCUMENTAI_ENDPOINT")
+        self.client_options = {"api_endpoint": endpoint} if endpoint else None
+
+        logger.debug("ocr_config", extra={
+            "project": self.project_id,
+            "location": self.location,
+            "processor": self.processor_id,
+        })
 
         if not self.project_id or not self.processor_id:
             raise RuntimeError("Missing GCP_PROJECT_ID or GCP_PROCESSOR_ID")
 
-        self.client = documentai.DocumentProcessorServiceClient()
-
-        self.processor_path = self.client.processor_path(
+        self.processor_path = documentai.DocumentProcessorServiceClient.processor_path(
             self.project_id, self.location, self.processor_id
         )
 
-    # ✨ NEW — The function your router expects
-    def extract_text(self, file_bytes: bytes) -> str:
+        self.pages_per_request = int(os.getenv("OCR_PAGES_PER_REQUEST", "10"))
+        self.page_concurrency = int(os.getenv("OCR_PAGE_CONCURRENCY", "4"))
+        self.page_retries = int(os.getenv("OCR_PAGE_RETRIES", "2"))
+
+        # The asyncio client binds to the running event loop, so it is
+        # created lazily on first use instead of at import time.
+        self._async_client = async_client
+
+    def _get_async_client(self):
+        if self._async_client is None:
+            self._async_client = documentai.DocumentProcessorServiceAsyncClient(
+                client_options=self.client_options
+            )
+        return self._async_client
+
+    def _build_request(self, file_bytes: bytes) -> documentai.ProcessRequest:
+        raw_document = documentai.RawDocument(
+            content=file_bytes,
+            mime_type="application/pdf"
+        )
+
+        return documentai.ProcessRequest(
+            name=self.processor_path,
+            raw_document=raw_document
+        )
+
+    def _document_text(self, document) -> str:
+        text = document.text if document.text else ""
+        logger.debug("ocr_text", extra={"chars": len(text), "pages": len(document.pages)})
+        return text
+
+    def _document_layout(self, document) -> dict:
         """
-        Sends a document to Google Document AI and returns extracted text.
+        Compact, JSON-ready copy of the structure Document AI returned:
+        tables as rows of cell strings, form fields as name/value pairs,
+        and entities. Text anchors are resolved against document.text so
+        the result does not depend on the protobuf types.
         """
+        text = document.text or ""
 
-        try:
-            raw_document = documentai.RawDocument(
-                content=file_bytes,
-                mime_type="application/pdf"
-            )
+        def anchor_text(layout) -> str:
+            segments = layout.text_anchor.text_segments
+            return "".join(
+                text[int(seg.start_index):int(seg.end_index)] for seg in segments
+            ).strip()
 
-            request = documentai.ProcessRequest(
-                name=self.processor_path,
-                raw_document=raw_document
-            )
+        def rows(table_rows) -> list:
+            return [[anchor_text(cell.layout) for cell in row.cells] for row in table_rows]
 
-            result = self.client.process_document(request=request)
-            document = result.document
+        tables = []
+        fields = []
+        for page_no, page in enumerate(document.pages, start=1):
+            for table in page.tables:
+                tables.append({
+                    "page": page_no,
+                    "header": rows(table.header_rows),
+                    "rows": rows(table.body_rows),
+                })
+            for field in page.form_fields:
+                fields.append({
+                    "page": page_no,
+                    "name": anchor_text(field.field_name),
+                    "value": anchor_text(field.field_value),
+                    "confidence": round(field.field_value.confidence, 3),
+                })
 
-            text = document.text if document.text else ""
+        entities = [
+            {
+                "type": entity.type_,
+                "text": entity.mention_text,
+                "confidence": round(entity.confidence, 3),
+            }
+            for entity in document.entities
+        ]
 
-            print("[OCR DEBUG] Extracted text:")
-            print(text[:500])
+        return {
+            "pages": len(document.pages),
+            "tables": tables,
+            "fields": fields,
+            "entities": entities,
+        }
 
-            return text
+    async def extract_document_async(
+        self,
+        file_bytes: bytes,
+        on_pages: Optional[Callable[[int, int], None]] = None,
+        limit: Optional[asyncio.Semaphore] = None,
+    ) -> Tuple[str, dict]:
+        """
+        Sends a document to Google Document AI.
+        Returns (text, layout); see _document_layout for the layout shape.
+        Long PDFs are OCR'd as parallel page ranges; on_pages(done, total)
+        is called as each range finishes.
+
+        Requests run at most OCR_PAGE_CONCURRENCY at a time. Pass one
+        limit (see new_page_limit) to calls OCR'ing parts of the same
+        document so they share that cap.
+        """
+        record_bytes("ocr", len(file_bytes))
+        limit = limit or self.new_page_limit()
+
+        try:
+            parts = await asyncio.to_thread(self._split, file_bytes)
+            if parts is None:
+                request = self._build_request(file_bytes)
+                async with limit:
+                    result = await self._get_async_client().process_document(request=request)
+                return self._document_text(result.document), self._document_layout(result.document)
+
+            documents = await self._process_ranges(parts, on_pages, limit)
+            return self._merge(parts, documents)
 
         except Exception as e:
             raise RuntimeError(f"Document AI OCR failed: {e}")
 
+    def _split(self, file_bytes: bytes) -> Optional[List[Tuple[int, int, bytes]]]:
+        """Page ranges for a long PDF, or None to send the file as-is."""
+        if page_count(file_bytes) <= self.pages_per_request:
+            return None
+        return split_pages(file_bytes, self.pages_per_request)
+
+    def new_page_limit(self) -> asyncio.Semaphore:
+        """Per-document cap on concurrent Document AI requests."""
+        return asyncio.Semaphore(self.page_concurrency)
+
+    async def _process_ranges(self, parts, on_pages, limit: asyncio.Semaphore) -> list:
+        """
+        OCR every range, a bounded number at a time. After each round only
+        the ranges that failed are sent again.
+        """
+        client = self._get_async_client()
+        total = parts[-1][1]
+        done = 0
+
+        async def process(part):
+            nonlocal done
+            first, last, chunk = part
+            async with limit:
+                result = await client.process_document(request=self._build_request(chunk))
+            done += last - first + 1
+            if on_pages:
+                on_pages(done, total)
+            return result.document
+
+        documents = [None] * len(parts)
+        pending = list(range(len(parts)))
+
+        for attempt in range(self.page_retries + 1):
+            results = await asyncio.gather(
+                *(process(parts[i]) for i in pending), return_exceptions=True
+            )
+            failed = []
+            for i, result in zip(pending, results):
+                if isinstance(result, BaseException):
+                    failed.append(i)
+                    error = result
+                else:
+                    documents[i] = result
+            pending = failed
+            if not pending:
+                return documents
+
+        pages = ", ".join(f"{parts[i][0]}-{parts[i][1]}" for i in pending)
+        raise RuntimeError(f"pages {pages} failed after {self.page_retries + 1} attempts: {error}")
+
+    def _merge(self, parts, documents) -> Tuple[str, dict]:
+        """Concatenate per-range text and layout, renumbering pages."""
+        texts = []
+        layout = {"pages": 0, "tables": [], "fields": [], "entities": []}
+
+        for (first, _, _), document in zip(parts, documents):
+            text = document.text or ""
+            if texts and text and not texts[-1].endswith("\n"):
+                texts.append("\n")
+            texts.append(text)
+
+            part = self._document_layout(document)
+            layout["pages"] += part["pages"]
+            for key in ("tables", "fields"):
+                for item in part[key]:
+                    item["page"] += first - 1
+                    layout[key].append(item)
+            layout["entities"].extend(part["entities"])
+
+        merged = "".join(texts)
+        logger.debug("ocr_merged", extra={"ranges": len(parts), "pages": layout["pages"], "chars": len(merged)})
+
+        return merged, layout
+
+
 # Export singleton
 ocr_service = OCRService()
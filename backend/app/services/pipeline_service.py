@@ -0,0 +1,261 @@
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Callable, Optional, Tuple
+
+from app.services.document_service import document_service
+from app.services.embedding_store import embedding_store
+from app.services.near_duplicate_service import near_duplicate_index
+from app.services.ingest_service import ingest_service
+from app.services.nlp_service import nlp_service
+from app.llm.gemini_client import gemini
+from app.detectors.hybrid_classifier import hybrid_classifier
+from app.extractors.hybrid_extractor import hybrid_extractor
+from app.utils.async_utils import gather_partial
+from app.utils.metrics import observe_stage, record_bytes
+
+
+class PipelineService:
+    """
+    Runs upload -> OCR -> classify -> extract in a single pass.
+
+    The OCR text is kept in memory between stages; it is written to the
+    text cache once so the per-stage endpoints can still reuse it later.
+
+    OCR and Gemini calls are each bounded by a process-wide semaphore
+    (PIPELINE_OCR_CONCURRENCY / PIPELINE_LLM_CONCURRENCY), so batches can
+    fan out freely while outbound load stays capped.
+    """
+
+    def __init__(self):
+        self.ocr_limit = asyncio.Semaphore(int(os.getenv("PIPELINE_OCR_CONCURRENCY", "4")))
+        self.llm_limit = asyncio.Semaphore(int(os.getenv("PIPELINE_LLM_CONCURRENCY", "8")))
+
+    async def run_stages(
+        self,
+        upload,
+        filename: Optional[str] = None,
+        override_type: Optional[str] = None,
+        include_summary: bool = False,
+        include_embeddings: bool = False,
+        combined: Optional[bool] = None,
+        reuse_near_duplicate: Optional[bool] = None,
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Async generator yielding (stage, payload) as each stage finishes.
+
+        upload is streamed to disk (any object with an async read(n), e.g.
+        UploadFile); FileTooLargeError is raised before the first yield.
+        """
+
+        # ------------------------------------------
+        # 1. UPLOAD
+        # ------------------------------------------
+        start = time.perf_counter()
+        file_id, deduplicated, size = await document_service.save_stream(upload)
+        observe_stage("upload", time.perf_counter() - start)
+        record_bytes("upload", size)
+        yield "upload", {
+            "file_id": file_id,
+            "filename": filename,
+            "deduplicated": deduplicated,
+            "elapsed_ms": _elapsed_ms(start),
+        }
+
+        # Identical content already uploaded: reuse its OCR text
+        stages = self.process_stages(
+            file_id,
+            reuse_text=deduplicated,
+            override_type=override_type,
+            include_summary=include_summary,
+            include_embeddings=include_embeddings,
+            combined=combined,
+            reuse_near_duplicate=reuse_near_duplicate,
+        )
+        async for stage, payload in stages:
+            yield stage, payload
+
+    async def process_stages(
+        self,
+        file_id: str,
+        file_bytes: Optional[bytes] = None,
+        reuse_text: bool = False,
+        override_type: Optional[str] = None,
+        include_summary: bool = False,
+        include_embeddings: bool = False,
+        combined: Optional[bool] = None,
+        reuse_near_duplicate: Optional[bool] = None,
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        OCR -> classify -> extract for a file that is already stored.
+        file_bytes are read from uploads/ when not given and OCR is needed.
+        With reuse_text=True, existing OCR text for file_id is used as-is.
+        With combined (default: gemini.combined_mode), classify and extract
+        share one Gemini call unless override_type is given.
+        With reuse_near_duplicate (default: NEAR_DUP_REUSE), a near-duplicate
+        of an earlier document is classified and extracted from that
+        document's text, so its cached Gemini results are reused.
+        """
+
+        # ------------------------------------------
+        # 2. OCR
+        # ------------------------------------------
+        start = time.perf_counter()
+        text = document_service.get_text(file_id) if reuse_text else None
+        ocr_reused = text is not None
+
+        if ocr_reused:
+            layout = document_service.get_layout(file_id) or {}
+        else:
+            if file_bytes is None:
+                file_bytes = await asyncio.to_thread(document_service.read_file_bytes, file_id)
+
+            # Embedded text layer first; Document AI only for scanned pages
+            async with self.ocr_limit:
+                text, layout = await ingest_service.extract_async(file_bytes)
+            document_service.save_text(file_id, text)
+            document_service.save_layout(file_id, layout)
+
+        # Re-scans of a known document: report the match, reuse on request.
+        # Reused text was indexed when it was OCR'd, so it is only looked
+        # up, and only when reuse is on (the lookup hashes the whole text).
+        reuse = near_duplicate_index.reuse if reuse_near_duplicate is None else reuse_near_duplicate
+        near_duplicate = None
+        if not ocr_reused:
+            near_duplicate = await asyncio.to_thread(near_duplicate_index.add, file_id, text)
+        elif reuse:
+            near_duplicate = await asyncio.to_thread(near_duplicate_index.find, text, file_id)
+
+        yield "ocr", {
+            "file_id": file_id,
+            "text": text,
+            "deduplicated": ocr_reused,
+            "ocr_pages": layout.get("ocr_pages"),
+            "text_layer_pages": layout.get("text_layer_pages"),
+            "near_duplicate": near_duplicate,
+            "elapsed_ms": _elapsed_ms(start),
+        }
+
+        reused_near_duplicate = False
+        if reuse and near_duplicate:
+            prior_text = document_service.get_text(near_duplicate["file_id"])
+            if prior_text is not None:
+                text = prior_text
+                layout = document_service.get_layout(near_duplicate["file_id"]) or {}
+                reused_near_duplicate = True
+
+        # ------------------------------------------
+        # 3. CLASSIFY
+        # ------------------------------------------
+        start = time.perf_counter()
+        use_combined = gemini.combined_mode if combined is None else combined
+        use_combined = use_combined and not override_type
+
+        # Local rules first; the semaphore is only taken for Gemini
+        extraction = None
+        detected = hybrid_classifier.classify_local(text)
+        if detected is None:
+            async with self.llm_limit:
+                if use_combined:
+                    detected, extraction = await hybrid_classifier.classify_and_extract_remote_async(text)
+                else:
+                    detected = await hybrid_classifier.classify_remote_async(text)
+        detected_type = detected.get("document_type", "unknown")
+        confidence = detected.get("confidence", 0.0)
+        observe_stage("classify", time.perf_counter() - start)
+        yield "detect", {
+            "file_id": file_id,
+            "document_type": detected_type,
+            "confidence": confidence,
+            "classified_by": detected.get("classified_by"),
+            "elapsed_ms": _elapsed_ms(start),
+        }
+
+        # ------------------------------------------
+        # 4. EXTRACT (+ optional summary / embeddings)
+        # ------------------------------------------
+        start = time.perf_counter()
+        used_type = override_type or detected_type
+
+        # Independent calls run concurrently with per-call timeouts
+        combined_call = use_combined and detected.get("classified_by") == "gemini"
+        calls = {}
+        if extraction is None:
+            calls["extraction"] = hybrid_extractor.extract_async(text, used_type, layout)
+        if include_summary:
+            calls["summary"] = nlp_service.summarize_async(text)
+        if include_embeddings:
+            calls["embeddings"] = nlp_service.embed_text_async(text)
+
+        results, errors = await gather_partial(calls, limit=self.llm_limit)
+        if "extraction" in calls:
+            extraction = results["extraction"]
+
+        # Keep the vector for /api/search/similar
+        if results.get("embeddings"):
+            embedding_store.add(file_id, results["embeddings"], used_type)
+
+        yield "extract", {
+            "file_id": file_id,
+            "detected_type": detected_type,
+            "used_type": used_type,
+            "override_used": override_type is not None,
+            "combined_call": combined_call,
+            "detection_confidence": confidence,
+            "classified_by": detected.get("classified_by"),
+            "near_duplicate": near_duplicate,
+            "reused_near_duplicate": reused_near_duplicate,
+            "extraction": extraction,
+            "summary": results.get("summary"),
+            "embeddings": results.get("embeddings"),
+            "errors": errors,
+            "elapsed_ms": _elapsed_ms(start),
+        }
+
+    async def run(self, upload, **options) -> dict:
+        """
+        Run every stage and return the combined result.
+
+        The shape matches /api/extract, plus the filename, OCR text,
+        dedup flags and per-stage timings.
+        """
+        return await self.collect(self.run_stages(upload, **options))
+
+    async def collect(
+        self,
+        stages: AsyncIterator[Tuple[str, dict]],
+        on_stage: Optional[Callable[[str, dict], None]] = None,
+    ) -> dict:
+        """
+        Fold a stage stream into one combined result dict.
+        on_stage(stage, timings_so_far) is called as each stage finishes.
+        """
+
+        result = {}
+        timings = {}
+
+        async for stage, payload in stages:
+            timings[stage] = payload.pop("elapsed_ms")
+            if on_stage:
+                on_stage(stage, timings)
+
+            if stage == "upload":
+                result["filename"] = payload["filename"]
+                result["deduplicated"] = payload["deduplicated"]
+            elif stage == "ocr":
+                result["text"] = payload["text"]
+                result["ocr_reused"] = payload["deduplicated"]
+                result["ocr_pages"] = payload["ocr_pages"]
+            elif stage == "extract":
+                result.update(payload)
+
+        result["timings_ms"] = timings
+        return result
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+# Singleton instance
+pipeline_service = PipelineService()
@@ -0,0 +1,53 @@
+# app/utils/async_utils.py
+
+import asyncio
+import os
+from typing import Awaitable, Dict, Optional, Tuple
+
+# Per-call timeout for fanned-out Gemini calls, in seconds
+LLM_CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT_S", "45"))
+
+
+async def gather_partial(
+    calls: Dict[str, Awaitable],
+    timeout: Optional[float] = None,
+    limit: Optional[asyncio.Semaphore] = None,
+) -> Tuple[dict, dict]:
+    """
+    Run named awaitables concurrently, each under its own timeout.
+
+    A call that fails or times out does not affect the others. With a
+    limit, each call first acquires the semaphore; time spent waiting for
+    it does not count against the timeout.
+
+    Returns:
+        (results, errors) — results[name] is None for failed calls and
+        errors[name] holds a short reason for each of them.
+    """
+
+    timeout = LLM_CALL_TIMEOUT if timeout is None else timeout
+    names = list(calls)
+
+    async def run(call: Awaitable):
+        if limit is None:
+            return await asyncio.wait_for(call, timeout)
+        async with limit:
+            return await asyncio.wait_for(call, timeout)
+
+    outcomes = await asyncio.gather(
+        *(run(calls[name]) for name in names),
+        return_exceptions=True,
+    )
+
+    results, errors = {}, {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            results[name] = None
+            errors[name] = f"timed out after {timeout:g}s"
+        elif isinstance(outcome, BaseException):
+            results[name] = None
+            errors[name] = str(outcome)
+        else:
+            results[name] = outcome
+
+    return results, errors
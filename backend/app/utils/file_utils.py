@@ -0,0 +1,63 @@
+# app/utils/file_utils.py
+
+import json
+
+from fastapi import HTTPException
+
+# Allowance for multipart boundaries and part headers in the request body
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class BodyLimitMiddleware:
+    """
+    Pure ASGI middleware capping request bodies per path prefix, before
+    FastAPI parses (and spools) multipart forms:
+
+        app.add_middleware(BodyLimitMiddleware, limits={"/api/upload": 50 * 2**20})
+
+    A Content-Length over the limit is answered with 413 without reading
+    the body. Otherwise the body is counted as it streams in, and the
+    request fails with 413 as soon as the limit is passed, so chunked
+    uploads cannot exceed it either. The per-file limit is still applied
+    while saving (see document_service.save_stream).
+    """
+
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = limits
+
+    def _limit_for(self, path: str):
+        for prefix, limit in self.limits.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return limit
+        return None
+
+    async def __call__(self, scope, receive, send):
+        limit = self._limit_for(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            body = json.dumps({"detail": "Upload too large"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI re-raises HTTPExceptions from body parsing
+                    raise HTTPException(status_code=413, detail="Upload too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
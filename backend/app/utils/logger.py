@@ -0,0 +1,161 @@
+# app/utils/logger.py
+
+"""
+Structured, non-blocking logging.
+
+Callers log through the standard library:
+
+    logger = get_logger(__name__)
+    logger.info("cache_hit", extra={"operation": "classify", "tier": "memory"})
+
+The record is put on an in-memory queue and the call returns; a
+background QueueListener thread formats it as one JSON line and writes it
+to stdout. The request path never waits on stdout.
+
+Each line carries the request's correlation id (X-Request-ID, or one
+generated by RequestIdMiddleware). The id is held in a contextvar, so
+asyncio tasks and asyncio.to_thread calls started by the request inherit
+it, including background pipeline jobs.
+
+High-volume events (cache hits, cache writes) go through sampled(): only
+LOG_SAMPLE_RATE of them are logged (default 0.01, 1 = all, 0 = none).
+
+Settings:
+    LOG_LEVEL        DEBUG | INFO | WARNING | ERROR (default INFO)
+    LOG_SAMPLE_RATE  share of sampled events logged (default 0.01)
+
+Never pass document text in a log record; log sizes and ids instead.
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+from typing import Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+
+ROOT_LOGGER = "docai"
+REQUEST_ID_HEADER = b"x-request-id"
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else came in through extra=
+_STANDARD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current correlation id, on the caller's thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, event, request_id, extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The default prepare() formats the message on the caller's thread;
+        # the listener does that. Only the exception is resolved here,
+        # since its traceback cannot cross threads lazily.
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging():
+    """Attach the queue handler to the "docai" logger. Safe to call twice."""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JSONFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(handler)
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under "docai" (e.g. docai.app.services.cache_service)."""
+    setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def sampled(rate: Optional[float] = None) -> bool:
+    """True for roughly `rate` of calls (default LOG_SAMPLE_RATE)."""
+    rate = SAMPLE_RATE if rate is None else rate
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+class RequestIdMiddleware:
+    """
+    Pure ASGI middleware: takes the request's X-Request-ID (or generates
+    one), makes it the correlation id for everything logged while the
+    request is handled, and echoes it on the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_id = dict(scope["headers"]).get(REQUEST_ID_HEADER, b"").decode("latin-1")[:64] or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER, request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,155 @@
+# app/utils/metrics.py
+
+"""
+Prometheus metrics, exposed at GET /metrics.
+
+    docai_stage_duration_seconds{stage}        upload, ocr, classify, extract,
+                                               summarize, embed
+    docai_cache_requests_total{operation,result}   result = hit | miss
+    docai_gemini_errors_total{operation}
+    docai_bytes_processed_total{kind}          kind = upload | ocr
+    docai_requests_in_flight{handler}          route template, e.g.
+                                               /api/jobs/{job_id}, or unmatched
+
+Recording is an in-process counter update (no I/O), so it is cheap on
+the request path.
+
+Multiple uvicorn workers: set PROMETHEUS_MULTIPROC_DIR to an empty,
+writable directory shared by the workers before they start. Each worker
+then writes its samples to mmap'd files there and /metrics aggregates
+all of them, whichever worker serves the scrape. Clear the directory
+between deployments. A worker that shuts down calls mark_process_dead()
+so its in-flight gauge stops counting; under gunicorn also call it from
+the child_exit hook, for workers that are killed.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from starlette.routing import compile_path
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+STAGE_DURATION = Histogram(
+    "docai_stage_duration_seconds",
+    "Latency of each processing stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+CACHE_REQUESTS = Counter(
+    "docai_cache_requests_total",
+    "Gemini result cache lookups",
+    ["operation", "result"],
+)
+
+GEMINI_ERRORS = Counter(
+    "docai_gemini_errors_total",
+    "Failed Gemini API calls",
+    ["operation"],
+)
+
+BYTES_PROCESSED = Counter(
+    "docai_bytes_processed_total",
+    "Document bytes received and sent to OCR",
+    ["kind"],
+)
+
+IN_FLIGHT = Gauge(
+    "docai_requests_in_flight",
+    "HTTP requests currently being handled",
+    ["handler"],
+    multiprocess_mode="livesum",
+)
+
+
+@contextmanager
+def track_stage(stage: str):
+    """Time the enclosed block into docai_stage_duration_seconds."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_DURATION.labels(stage).observe(time.perf_counter() - start)
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_DURATION.labels(stage).observe(seconds)
+
+
+def record_cache(operation: str, hit: bool, count: int = 1):
+    if count:
+        CACHE_REQUESTS.labels(operation, "hit" if hit else "miss").inc(count)
+
+
+def record_gemini_error(operation: str):
+    GEMINI_ERRORS.labels(operation).inc()
+
+
+def record_bytes(kind: str, size: int):
+    BYTES_PROCESSED.labels(kind).inc(size)
+
+
+class InFlightMiddleware:
+    """
+    Pure ASGI middleware maintaining docai_requests_in_flight.
+
+    The handler label is the route template from the app's OpenAPI paths
+    (e.g. /api/jobs/{job_id}), or "unmatched": raw paths carry ids, and
+    arbitrary 404 paths would explode label cardinality. The request is
+    counted from its start, before the router runs, so the templates are
+    matched here rather than read from scope["route"] afterwards.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._templates = None  # [(regex, template)], built on first request
+
+    def _handler(self, scope) -> str:
+        if self._templates is None:
+            paths = scope["app"].openapi()["paths"]
+            self._templates = [(compile_path(path)[0], path) for path in paths]
+
+        for regex, template in self._templates:
+            if regex.match(scope["path"]):
+                return template
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        gauge = IN_FLIGHT.labels(self._handler(scope))
+        gauge.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gauge.dec()
+
+
+def mark_process_dead(pid: int = None):
+    """Drop a finished worker's live gauge samples (multiprocess mode only)."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def render() -> tuple:
+    """(body, content_type) for the /metrics response."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
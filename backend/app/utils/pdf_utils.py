@@ -0,0 +1,62 @@
+import io
+from typing import List, Sequence, Tuple
+
+from pypdf import PdfReader, PdfWriter
+
+
+def page_count(file_bytes: bytes) -> int:
+    """Number of pages, or 0 if the bytes are not a readable PDF."""
+    try:
+        return len(PdfReader(io.BytesIO(file_bytes)).pages)
+    except Exception:
+        return 0
+
+
+def _write_pages(reader: PdfReader, indices: Sequence[int]) -> bytes:
+    writer = PdfWriter()
+    for i in indices:
+        writer.add_page(reader.pages[i])
+
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+def split_pages(file_bytes: bytes, pages_per_part: int) -> List[Tuple[int, int, bytes]]:
+    """
+    Split a PDF into consecutive page ranges.
+
+    Returns:
+        [(first_page, last_page, pdf_bytes), ...] with 1-based, inclusive
+        page numbers, in page order.
+    """
+    reader = PdfReader(io.BytesIO(file_bytes))
+    total = len(reader.pages)
+
+    parts = []
+    for start in range(0, total, pages_per_part):
+        end = min(start + pages_per_part, total)
+        parts.append((start + 1, end, _write_pages(reader, range(start, end))))
+
+    return parts
+
+
+def select_pages(file_bytes: bytes, pages: Sequence[int]) -> bytes:
+    """A new PDF holding only the given 1-based pages, in the order given."""
+    reader = PdfReader(io.BytesIO(file_bytes))
+    return _write_pages(reader, [p - 1 for p in pages])
+
+
+def page_texts(file_bytes: bytes) -> List[str]:
+    """
+    Embedded text layer of each page ("" for image-only pages).
+    Raises if the bytes are not a readable PDF.
+    """
+    reader = PdfReader(io.BytesIO(file_bytes))
+    texts = []
+    for page in reader.pages:
+        try:
+            texts.append(page.extract_text() or "")
+        except Exception:
+            texts.append("")
+    return texts
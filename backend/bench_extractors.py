@@ -0,0 +1,110 @@
+"""
+Benchmark the rule-based extractors on the stored OCR texts.
+
+Runs every extractor over every cache/*.txt file and reports the mean
+per-document extraction time (best of --repeat runs, to damp noise).
+
+With --baseline, the extractors as they were at a git revision (default:
+just before the shared pattern registry, i.e. per-call re.search on raw
+pattern strings) are loaded with `git show` and timed on the same texts,
+side by side with the current ones.
+
+Usage:
+    python bench_extractors.py [--rounds 50] [--repeat 5] [--glob "cache/*.txt"]
+                               [--baseline [REV]]
+"""
+
+import argparse
+import glob
+import subprocess
+import time
+
+from app.extractors.invoice_extractor import invoice_extractor
+from app.extractors.receipt_extractor import receipt_extractor
+from app.extractors.id_extractor import id_extractor
+from app.extractors.po_extractor import po_extractor
+
+EXTRACTORS = {
+    "invoice": invoice_extractor,
+    "receipt": receipt_extractor,
+    "id_card": id_extractor,
+    "purchase_order": po_extractor,
+}
+
+parser = argparse.ArgumentParser(description="Time rule-based extractors per document")
+parser.add_argument("--rounds", type=int, default=50)
+parser.add_argument("--repeat", type=int, default=5)
+parser.add_argument("--glob", default="cache/*.txt")
+parser.add_argument("--baseline", nargs="?", const="", metavar="REV",
+                    help="also time the extractors at REV (default: before the pattern registry)")
+args = parser.parse_args()
+
+
+def _git(*argv) -> str:
+    return subprocess.run(["git", *argv], capture_output=True, text=True, check=True).stdout
+
+
+def load_baseline(rev: str) -> dict:
+    """The extractor singletons as of rev, executed from `git show` source."""
+    if not rev:
+        added = _git("log", "--diff-filter=A", "--format=%H", "--", "app/extractors/patterns.py").split()
+        if not added:
+            raise SystemExit("Cannot find the pattern registry commit; pass --baseline REV")
+        rev = added[-1] + "^"
+
+    baseline = {}
+    for name, extractor in EXTRACTORS.items():
+        module = type(extractor).__module__.rsplit(".", 1)[-1]
+        source = _git("show", f"{rev}:./app/extractors/{module}.py")
+        namespace = {"__name__": f"baseline.{module}"}
+        exec(compile(source, f"{rev}:{module}.py", "exec"), namespace)
+        baseline[name] = namespace[module]
+    return baseline
+
+
+def time_per_doc(extractor) -> float:
+    """Best-of-repeat mean microseconds per document."""
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for text in texts:
+                extractor.extract(text)
+        best = min(best, time.perf_counter() - start)
+    return best / (args.rounds * len(texts)) * 1e6
+
+
+texts = []
+for path in sorted(glob.glob(args.glob)):
+    with open(path, "r", encoding="utf-8") as f:
+        texts.append(f.read())
+
+if not texts:
+    raise SystemExit(f"No documents match {args.glob}")
+
+print(f"{len(texts)} documents, {sum(map(len, texts))} chars, "
+      f"{args.rounds} rounds x {args.repeat} repeats\n")
+
+if args.baseline is None:
+    print(f"{'extractor':<16}{'us/doc':>10}")
+
+    total = 0.0
+    for name, extractor in EXTRACTORS.items():
+        per_doc = time_per_doc(extractor)
+        total += per_doc
+        print(f"{name:<16}{per_doc:>10.1f}")
+
+    print(f"{'all':<16}{total:>10.1f}")
+
+else:
+    baseline = load_baseline(args.baseline)
+    print(f"{'extractor':<16}{'baseline':>10}{'current':>10}{'speedup':>10}  (us/doc)")
+
+    totals = [0.0, 0.0]
+    for name, extractor in EXTRACTORS.items():
+        old, new = time_per_doc(baseline[name]), time_per_doc(extractor)
+        totals[0] += old
+        totals[1] += new
+        print(f"{name:<16}{old:>10.1f}{new:>10.1f}{old / new:>9.2f}x")
+
+    print(f"{'all':<16}{totals[0]:>10.1f}{totals[1]:>10.1f}{totals[0] / totals[1]:>9.2f}x")
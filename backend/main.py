@@ -10,6 +10,18 @@ from app.api.ocr_router import router as ocr_router
 from app.api.extract_router import router as extract_router
 from app.api.health_router import router as health_router
 from app.api.cache_router import router as cache_router  # ✅ NEW
+from app.api.process_router import router as process_router
+from app.api.batch_router import router as batch_router
+from app.api.jobs_router import router as jobs_router
+from app.api.search_router import router as search_router
+from app.api.embeddings_router import router as embeddings_router
+from app.api.metrics_router import router as metrics_router
+from app.services.batch_service import batch_service
+from app.services.document_service import document_service
+from app.services.job_service import job_service
+from app.utils.file_utils import BodyLimitMiddleware, MULTIPART_OVERHEAD
+from app.utils.logger import RequestIdMiddleware
+from app.utils.metrics import InFlightMiddleware, mark_process_dead
 
 app = FastAPI(
     title="DocAI — Universal Document Ingestion",
@@ -24,6 +36,19 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Cap upload bodies before the multipart form is parsed
+_upload_limit = document_service.max_upload_bytes + MULTIPART_OVERHEAD
+app.add_middleware(
+    BodyLimitMiddleware,
+    limits={
+        "/api/upload": _upload_limit,
+        "/api/process": _upload_limit,
+        "/api/jobs": _upload_limit,
+        "/api/batch": batch_service.max_files * _upload_limit,
+    },
+)
+app.add_middleware(InFlightMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 # Routers
 app.include_router(upload_router)
@@ -32,6 +57,25 @@ app.include_router(ocr_router)
 app.include_router(extract_router)
 app.include_router(health_router)
 app.include_router(cache_router)  # ✅ NEW
+app.include_router(process_router)
+app.include_router(batch_router)
+app.include_router(jobs_router)
+app.include_router(search_router)
+app.include_router(embeddings_router)
+app.include_router(metrics_router)
+
+
+# Background job workers
+@app.on_event("startup")
+async def start_job_workers():
+    await job_service.start()
+
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await job_service.stop()
+    mark_process_dead()
+
 
 @app.get("/")
 def root():
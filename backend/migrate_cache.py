@@ -0,0 +1,23 @@
+"""
+Import the legacy one-JSON-file-per-key Gemini cache into the SQLite
+cache backend.
+
+Usage:
+    python migrate_cache.py [--json-dir cache/gemini] [--db cache/gemini.db]
+"""
+
+import argparse
+
+from app.services.cache_backends import SQLiteBackend
+
+parser = argparse.ArgumentParser(description="Migrate JSON cache files into SQLite")
+parser.add_argument("--json-dir", default="cache/gemini")
+parser.add_argument("--db", default="cache/gemini.db")
+args = parser.parse_args()
+
+backend = SQLiteBackend(args.db)
+result = backend.import_json_dir(args.json_dir)
+
+print(f"Imported {result['imported']} entries "
+      f"({result['skipped']} already present, {result['failed']} unreadable)")
+print(backend.stats())
@@ -1,5 +1,5 @@
 import React, { useState, useRef } from "react";
-import { uploadInvoice, runOCR, runDetect, runExtract } from "./api/invoice";
+import { submitJob, waitForJob } from "./api/invoice";
 import DragDrop from "./components/DragDrop";
 import PdfPreview from "./components/PdfPreview";
 import CacheStats from "./components/CacheStats";
@@ -44,27 +44,20 @@ export default function App() {
         setLoadingStep("Uploading file...");
 
         try {
-            const up = await uploadInvoice(file);
-            const fileId = up.file_id ?? up.id;
-
-            setLoadingStep("Running OCR...");
-            await runOCR(fileId);
-
-            setLoadingStep("Running detection...");
-            const detectStart = Date.now();
-            await runDetect(fileId);
-            const detectTime = Date.now() - detectStart;
-
-            // Emit cache status (if response < 500ms, likely cache hit)
-            emitCacheStatus('detect', detectTime < 500);
-
-            setLoadingStep("Running extract...");
-            const extractStart = Date.now();
-            const extracted = await runExtract(fileId, true, false);
-            const extractTime = Date.now() - extractStart;
-
-            // Emit cache status
-            emitCacheStatus('extract', extractTime < 500);
+            const job = await submitJob(file, true, false);
+            const stageLabels = {
+                ocr: "Running detection...",
+                detect: "Running extract...",
+                extract: "Finishing...",
+            };
+            const extracted = await waitForJob(job.id, (j) => {
+                setLoadingStep(j.stage ? stageLabels[j.stage] : "Running OCR...");
+            });
+            const timings = extracted.timings_ms || {};
+
+            // Emit cache status (if a stage took < 500ms, likely cache hit)
+            emitCacheStatus('detect', (timings.detect ?? Infinity) < 500);
+            emitCacheStatus('extract', (timings.extract ?? Infinity) < 500);
 
             setResult(extracted);
             setLoadingStep("");
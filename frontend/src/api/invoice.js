@@ -37,3 +37,35 @@ export async function runExtract(fileId, include_summary = true, include_embeddi
     const resp = await API.post(`/api/extract/${fileId}`, null, { params });
     return resp.data;
 }
+
+// queue upload -> OCR -> detect -> extract as a background job -> POST /api/jobs
+export async function submitJob(file, include_summary = true, include_embeddings = false) {
+    const fd = new FormData();
+    fd.append("file", file);
+    const params = {
+        include_summary: include_summary ? "true" : "false",
+        include_embeddings: include_embeddings ? "true" : "false",
+    };
+    const resp = await API.post("/api/jobs", fd, {
+        params,
+        headers: { "Content-Type": "multipart/form-data" },
+    });
+    return resp.data;
+}
+
+// job status -> GET /api/jobs/{job_id}
+export async function getJob(jobId) {
+    const resp = await API.get(`/api/jobs/${jobId}`);
+    return resp.data;
+}
+
+// poll a job until it is done or failed; onProgress(job) on every poll
+export async function waitForJob(jobId, onProgress = () => {}, intervalMs = 1000) {
+    for (;;) {
+        const job = await getJob(jobId);
+        onProgress(job);
+        if (job.status === "done") return job.result;
+        if (job.status === "failed") throw new Error(job.error || "Job failed");
+        await new Promise((r) => setTimeout(r, intervalMs));
+    }
+}